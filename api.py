@@ -5,16 +5,31 @@ A secure REST API for GitHub Auto-Follow Bot
 Created by: dewhush
 """
 
-from fastapi import FastAPI, BackgroundTasks, HTTPException, Depends, Security
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Security
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import APIKeyHeader
 from pydantic import BaseModel
 import asyncio
+import json
 import logging
 import os
-from typing import Optional
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
 from dotenv import load_dotenv
 
 from core import GitHubFollowerBot
+from events import EventBus, EventLog
+from history import RelationshipHistory
+from jobs import JobManager
+from leader import Coordinator
+from logging_setup import load_logging_config, setup_logging
+from metrics import REGISTRY
+from profiler import Profile, SamplingProfiler
+from scheduler import CycleScheduler
+from storage import atomic_write_json
+from worker import BotWorker
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +38,14 @@ load_dotenv()
 APP_NAME = os.getenv("APP_NAME", "GitHub-Followers-API")
 APP_ENV = os.getenv("APP_ENV", "development")
 API_KEY = os.getenv("API_KEY", "")
+# Shared by all uvicorn workers: leader lock, state snapshot and command spool
+COORDINATION_DIR = os.getenv("COORDINATION_DIR", ".coordination")
+SNAPSHOT_INTERVAL = 1.0   # how often the leader checks its state for changes to publish
+SNAPSHOT_MAX_AGE = 10.0   # older snapshots mean the leader is gone
+LEADER_RETRY_INTERVAL = 2.0
+EVENT_HEARTBEAT = 15.0    # comment line sent on idle event streams
+PROFILE_MAX_SECONDS = 300
+PROFILE_RELAY_MARGIN = 10.0   # extra wait for a profile taken by the leader
 
 # Security
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -49,7 +72,18 @@ app = FastAPI(
 
 # Global State
 bot: Optional[GitHubFollowerBot] = None
-is_running = False
+worker = BotWorker()
+jobs = JobManager(worker, api_calls=lambda: bot.api_calls if bot else 0)
+warm_up_task: Optional[asyncio.Task] = None
+startup_error: Optional[str] = None
+coordinator: Optional[Coordinator] = None   # created at startup
+coordination_task: Optional[asyncio.Task] = None
+log_listener = None
+history: Optional[RelationshipHistory] = None
+# Live events; while other workers run, the leader also appends them to a file they tail
+events = EventBus()
+event_log: Optional[EventLog] = None
+profiler = SamplingProfiler()
 
 # Response Models
 class HealthResponse(BaseModel):
@@ -57,6 +91,11 @@ class HealthResponse(BaseModel):
     app_name: str
     environment: str
 
+class ReadyResponse(BaseModel):
+    status: str
+    authenticated_as: Optional[str] = None
+    detail: Optional[str] = None
+
 class StatusResponse(BaseModel):
     status: str
     is_running: bool
@@ -72,6 +111,31 @@ class MessageResponse(BaseModel):
     message: str
     success: bool = True
 
+class JobResponse(BaseModel):
+    id: str
+    action: str
+    status: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    api_calls: int = 0
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+class HistoryEvent(BaseModel):
+    id: int
+    ts: str
+    login: str
+    event: str
+
+class HistoryResponse(BaseModel):
+    events: List[HistoryEvent]
+    next_cursor: Optional[str] = None
+
+class UserHistoryResponse(HistoryResponse):
+    login: str
+
 # ASCII Banner
 BANNER = """
    _____ _ _   _           _       ______    _ _                            
@@ -86,19 +150,162 @@ BANNER = """
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize bot on startup"""
+    """Elect the leader worker, which initializes the bot"""
     print(BANNER)
     print(f"  📦 App: {APP_NAME}")
     print(f"  🌍 Environment: {APP_ENV}")
     print(f"  🔐 API Key Protection: {'Enabled' if API_KEY else 'Disabled'}")
     print()
     
-    global bot
+    global coordination_task, log_listener, coordinator, event_log
+    log_listener = setup_logging(load_logging_config())
+    events.attach(asyncio.get_running_loop())
+    coordinator = Coordinator(Path(COORDINATION_DIR))
+    event_log = EventLog(Path(COORDINATION_DIR) / 'events.jsonl')
+    if coordinator.try_lead():
+        start_bot()
+    else:
+        logging.info(f"👥 Worker {os.getpid()} serves reads from the leader's snapshot")
+    coordination_task = asyncio.create_task(coordinate())
+
+def start_bot():
+    """Create the bot (leader only); authentication runs in the background"""
+    global bot, warm_up_task, startup_error
     try:
+        # Cheap: authentication and state loading happen in warm_up_bot()
         bot = GitHubFollowerBot()
-        logging.info(f"✅ Bot initialized successfully")
     except Exception as e:
+        startup_error = str(e)
         logging.error(f"❌ Failed to initialize bot: {e}")
+        return
+    bot.on_event = events.publish
+    warm_up_task = asyncio.create_task(warm_up_bot())
+
+async def warm_up_bot():
+    """Authenticate and load bot state in the background, retrying until it works"""
+    global startup_error
+    delay = 5
+    while True:
+        try:
+            await worker.run(bot.warm_up)
+            startup_error = None
+            logging.info("✅ Bot initialized successfully")
+            return
+        except Exception as e:
+            startup_error = str(e)
+            logging.warning(f"⏳ Bot warm-up failed, retrying in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 300)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop bot work and flush pending bot state on shutdown"""
+    if coordination_task:
+        coordination_task.cancel()
+    scheduler.stop()
+    if warm_up_task:
+        warm_up_task.cancel()
+    if bot:
+        bot.cancel()
+    await asyncio.get_running_loop().run_in_executor(None, worker.shutdown)
+    await scheduler.join(timeout=5)
+    if bot:
+        bot.close()
+        logging.info("💾 Bot state flushed")
+    if coordinator:
+        coordinator.workers.leave()
+        coordinator.lock.release()
+    if event_log:
+        event_log.close()
+    if history:
+        history.close()
+    if log_listener:
+        log_listener.stop()
+
+scheduler = CycleScheduler(
+    submit=worker.run,
+    run_cycle=lambda: bot.run_cycle(),
+    cancel=lambda: bot.cancel() if bot else None,
+    reset_cancel=lambda: bot.reset_cancel() if bot else None
+)
+
+# ============== Multi-Worker Coordination ==============
+
+async def coordinate():
+    """Leader: run spooled commands and publish the snapshot. Others: take over when the leader exits"""
+    last_published = last_attempt = 0.0
+    while True:
+        try:
+            if coordinator.is_leader:
+                commands = coordinator.commands.receive()
+                for command in commands:
+                    run_command(command)
+                if commands or time.monotonic() - last_published >= SNAPSHOT_INTERVAL:
+                    last_published = time.monotonic()
+                    await publish_snapshot()
+                # Only now, so a job is always visible in the spool or in the snapshot
+                coordinator.commands.acknowledge(commands)
+            else:
+                # Serve the leader's events to this worker's streams
+                for event in event_log.read_new():
+                    events.dispatch(*event)
+                if time.monotonic() - last_attempt >= LEADER_RETRY_INTERVAL:
+                    last_attempt = time.monotonic()
+                    coordinator.workers.heartbeat()
+                    if coordinator.try_lead():
+                        coordinator.workers.leave()
+                        # Take over from a leader that exited, keeping its loop running
+                        previous = coordinator.snapshot.read() or {}
+                        start_bot()
+                        if previous.get('status', {}).get('is_running'):
+                            start_loop()
+        except Exception as e:
+            logging.error(f"❌ Coordination error: {e}")
+        await asyncio.sleep(0.2)
+
+def run_command(command: dict):
+    """Execute a control command spooled by another worker"""
+    name = command.get('command')
+    if name == 'start':
+        start_loop()
+    elif name == 'stop':
+        scheduler.stop()
+    elif name == 'action' and command.get('action') in ACTIONS and bot:
+        submit_action(command['action'], job_id=command['id'])
+    elif name == 'profile':
+        asyncio.create_task(relay_profile(command))
+    else:
+        logging.warning(f"⚠️ Ignoring command: {command}")
+
+async def publish_snapshot():
+    """Write the leader's snapshot now (also after local changes, so other workers see them at once)"""
+    if not coordinator.is_leader:
+        return
+    loop = asyncio.get_running_loop()
+    # A single worker shares nothing: no snapshot, no event log
+    shared = await loop.run_in_executor(None, coordinator.workers.others) > 0
+    events.log = event_log if shared else None
+    if shared:
+        await loop.run_in_executor(None, coordinator.snapshot.write, build_snapshot())
+
+def build_snapshot() -> dict:
+    """State the other workers serve on /status, /ready, /metrics and /v1/jobs"""
+    return {
+        'ready': bool(bot and bot.ready),
+        'startup_error': startup_error,
+        'authenticated_as': bot.cached_login if bot else None,
+        'status': build_status().model_dump(),
+        'config': build_config().model_dump() if bot else None,
+        'metrics': REGISTRY.render(),
+        'jobs': jobs.snapshot(),
+    }
+
+def leader_snapshot() -> Optional[dict]:
+    """The leader's latest snapshot, None if there is no live leader"""
+    snapshot = coordinator.snapshot.read()
+    if not snapshot or time.time() - snapshot['updated_at'] > SNAPSHOT_MAX_AGE:
+        return None
+    return snapshot
 
 # ============== Public Endpoints ==============
 
@@ -111,33 +318,67 @@ async def health_check():
         environment=APP_ENV
     )
 
-@app.get("/status", response_model=StatusResponse, tags=["Status"])
-async def get_status():
-    """Get current bot status and statistics"""
+@app.get("/ready", response_model=ReadyResponse, tags=["Health"], responses={503: {"model": ReadyResponse}})
+async def readiness_check():
+    """Readiness check: 503 until the bot is authenticated and its state is loaded"""
+    if coordinator.is_leader:
+        ready, login, error = bool(bot and bot.ready), bot.cached_login if bot else None, startup_error
+    else:
+        snapshot = leader_snapshot() or {'ready': False, 'startup_error': "No leader worker", 'authenticated_as': None}
+        ready, login, error = snapshot['ready'], snapshot['authenticated_as'], snapshot['startup_error']
+    
+    if ready:
+        return ReadyResponse(status="ready", authenticated_as=login)
+    response = ReadyResponse(status="error" if error else "starting", detail=error)
+    return JSONResponse(status_code=503, content=response.model_dump())
+
+def build_status() -> StatusResponse:
+    """Status of the bot in this (leader) worker"""
     if not bot:
         return StatusResponse(
             status="Error: Bot not initialized",
             is_running=False
         )
     
+    if not bot.ready:
+        return StatusResponse(status="Starting", is_running=scheduler.running)
+    
     return StatusResponse(
-        status="Running" if is_running else "Stopped",
-        is_running=is_running,
-        authenticated_as=bot.user.login if bot.user else None,
+        status="Running" if scheduler.running else "Stopped",
+        is_running=scheduler.running,
+        authenticated_as=bot.cached_login,
         stats={
             "followed_count": len(bot.followed_users),
-            "farming_stats": bot.farming_stats
+            "farming_stats": bot.farming_stats,
+            "http_cache": bot.http_cache_stats(),
+            "rate_limit": bot.rate_limit_status(),
+            "notifications": bot.notification_stats(),
+            "scheduler": scheduler.status()
         }
     )
 
+@app.get("/status", response_model=StatusResponse, tags=["Status"])
+async def get_status():
+    """Get current bot status and statistics"""
+    if coordinator.is_leader:
+        return build_status()
+    snapshot = leader_snapshot()
+    if not snapshot:
+        return StatusResponse(status="Error: No leader worker", is_running=False)
+    return StatusResponse(**snapshot['status'])
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Status"])
+async def get_metrics():
+    """Prometheus metrics (text exposition format)"""
+    if coordinator.is_leader:
+        text = REGISTRY.render()
+    else:
+        text = (leader_snapshot() or {}).get('metrics', '')
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
 # ============== Protected Endpoints (v1) ==============
 
-@app.get("/v1/config", response_model=ConfigResponse, tags=["Configuration"], dependencies=[Depends(verify_api_key)])
-async def get_config():
-    """View current bot configuration"""
-    if not bot:
-        raise HTTPException(status_code=500, detail="Bot not initialized")
-    
+def build_config() -> ConfigResponse:
     return ConfigResponse(
         farming_enabled=bot.config.get('farming', {}).get('enabled', False),
         cleanup_enabled=bot.config.get('cleanup_non_followers', False),
@@ -147,73 +388,238 @@ async def get_config():
         }
     )
 
-# Background task for farming loop
-async def farming_loop():
-    """Background loop that runs the bot cycles"""
-    global is_running
-    while is_running:
-        if bot:
-            bot.run_cycle()
-        await asyncio.sleep(300)  # Wait 5 minutes between cycles
+@app.get("/v1/config", response_model=ConfigResponse, tags=["Configuration"], dependencies=[Depends(verify_api_key)])
+async def get_config():
+    """View current bot configuration"""
+    if not coordinator.is_leader:
+        config = (leader_snapshot() or {}).get('config')
+        if not config:
+            raise HTTPException(status_code=500, detail="Bot not initialized")
+        return ConfigResponse(**config)
+    
+    if not bot:
+        raise HTTPException(status_code=500, detail="Bot not initialized")
+    return build_config()
+
+def start_loop() -> bool:
+    return bool(bot) and scheduler.start(bot.config.get('check_interval_seconds', 300))
 
 @app.post("/v1/start", response_model=MessageResponse, tags=["Bot Control"], dependencies=[Depends(verify_api_key)])
-async def start_farming(background_tasks: BackgroundTasks):
+async def start_farming():
     """Start the farming background loop"""
-    global is_running
+    if not coordinator.is_leader:
+        coordinator.commands.send('start')
+        return MessageResponse(message="✅ Start sent to the leader worker")
     
-    if is_running:
+    if scheduler.running:
         return MessageResponse(message="Bot is already running", success=False)
     
     if not bot:
         raise HTTPException(status_code=500, detail="Bot not initialized (check logs/env)")
     
-    is_running = True
-    background_tasks.add_task(farming_loop)
+    start_loop()
+    await publish_snapshot()
     return MessageResponse(message="✅ Farming started in background")
 
 @app.post("/v1/stop", response_model=MessageResponse, tags=["Bot Control"], dependencies=[Depends(verify_api_key)])
 async def stop_farming():
     """Stop the farming background loop"""
-    global is_running
+    if not coordinator.is_leader:
+        coordinator.commands.send('stop')
+        return MessageResponse(message="🛑 Stop sent to the leader worker")
     
-    if not is_running:
+    if not scheduler.stop():
         return MessageResponse(message="Bot is not running", success=False)
-    
-    is_running = False
-    return MessageResponse(message="🛑 Farming stopping (will finish current cycle)")
+    await publish_snapshot()
+    return MessageResponse(message="🛑 Farming stopped (current action will be interrupted)")
 
-@app.post("/v1/follow-back", response_model=MessageResponse, tags=["Actions"], dependencies=[Depends(verify_api_key)])
-async def trigger_follow_back():
-    """Manually trigger follow-back check"""
+ACTIONS = {
+    "follow-back": lambda: bot.check_and_follow_back(),
+    "cleanup": lambda: bot.cleanup_non_followers(),
+    "farm": lambda: bot.farm_followers(),
+}
+
+def submit_action(action: str, job_id: Optional[str] = None) -> JobResponse:
+    """Queue a manual bot action, merging it with an identical in-flight job"""
+    if not coordinator.is_leader:
+        # The leader runs it under the command id
+        job_id = coordinator.commands.send('action', action=action)
+        return JobResponse(id=job_id, action=action, status="queued", created_at=datetime.now().isoformat())
+    
     if not bot:
         raise HTTPException(status_code=500, detail="Bot not initialized")
     
-    try:
-        bot.check_and_follow_back()
-        return MessageResponse(message="✅ Follow-back check completed")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    fn = ACTIONS[action]
+    
+    def task():
+        bot.reset_cancel()
+        snapshot = bot.activity_snapshot()
+        fn()
+        return bot.activity_since(snapshot)
+    
+    job, _ = jobs.submit(action, task, job_id=job_id)
+    return JobResponse(**job.to_dict())
 
-@app.post("/v1/cleanup", response_model=MessageResponse, tags=["Actions"], dependencies=[Depends(verify_api_key)])
+@app.post("/v1/follow-back", response_model=JobResponse, status_code=202, tags=["Actions"], dependencies=[Depends(verify_api_key)])
+async def trigger_follow_back():
+    """Queue a follow-back check"""
+    job = submit_action("follow-back")
+    await publish_snapshot()
+    return job
+
+@app.post("/v1/cleanup", response_model=JobResponse, status_code=202, tags=["Actions"], dependencies=[Depends(verify_api_key)])
 async def trigger_cleanup():
-    """Manually trigger cleanup of non-followers"""
-    if not bot:
-        raise HTTPException(status_code=500, detail="Bot not initialized")
+    """Queue a cleanup of non-followers"""
+    job = submit_action("cleanup")
+    await publish_snapshot()
+    return job
+
+@app.post("/v1/farm", response_model=JobResponse, status_code=202, tags=["Actions"], dependencies=[Depends(verify_api_key)])
+async def trigger_farm():
+    """Queue one farming cycle"""
+    job = submit_action("farm")
+    await publish_snapshot()
+    return job
+
+@app.get("/v1/jobs/{job_id}", response_model=JobResponse, tags=["Actions"], dependencies=[Depends(verify_api_key)])
+async def get_job(job_id: str):
+    """Get the status and result of a queued action"""
+    if not coordinator.is_leader:
+        shared = (leader_snapshot() or {}).get('jobs', {'jobs': {}, 'aliases': {}})
+        job = shared['jobs'].get(shared['aliases'].get(job_id, job_id))
+        if job:
+            return JobResponse(**job)
+        command = coordinator.commands.find(job_id)
+        if command:
+            created_at = datetime.fromtimestamp(command['sent_at']).isoformat()
+            return JobResponse(id=job_id, action=command.get('action', ''), status="queued", created_at=created_at)
+        raise HTTPException(status_code=404, detail="Job not found")
     
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(**job.to_dict())
+
+def get_history_db() -> RelationshipHistory:
+    """Read handle on the history database the leader's bot writes (any worker can read it)"""
+    global history
+    if history is None:
+        try:
+            with open("config.json", "r") as f:
+                history_config = json.load(f).get("history", {})
+        except (OSError, json.JSONDecodeError):
+            history_config = {}
+        path = history_config.get("path", "history.db")
+        if not path:
+            raise HTTPException(status_code=404, detail="History is disabled")
+        history = RelationshipHistory(Path(path))
+    return history
+
+@app.get("/v1/history", response_model=HistoryResponse, tags=["History"], dependencies=[Depends(verify_api_key)])
+async def get_history(
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    event: Optional[str] = None
+):
+    """Follow, follow-back and unfollow events since a time, oldest first"""
     try:
-        bot.cleanup_non_followers()
-        return MessageResponse(message="✅ Cleanup completed")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        events, next_cursor = get_history_db().since(
+            since.timestamp() if since else None, cursor=cursor, limit=limit, event=event
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return HistoryResponse(events=events, next_cursor=next_cursor)
 
-@app.post("/v1/farm", response_model=MessageResponse, tags=["Actions"], dependencies=[Depends(verify_api_key)])
-async def trigger_farm():
-    """Manually trigger one farming cycle"""
-    if not bot:
-        raise HTTPException(status_code=500, detail="Bot not initialized")
+@app.get("/v1/users/{login}", response_model=UserHistoryResponse, tags=["History"], dependencies=[Depends(verify_api_key)])
+async def get_user_history(login: str, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=1000)):
+    """Every recorded event of one user, oldest first"""
+    try:
+        events, next_cursor = get_history_db().for_login(login, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not events and not cursor:
+        raise HTTPException(status_code=404, detail="No history for this user")
+    return UserHistoryResponse(login=login, events=events, next_cursor=next_cursor)
+
+@app.get("/v1/events", tags=["Status"], dependencies=[Depends(verify_api_key)], response_class=StreamingResponse)
+async def stream_events(last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events: activity, phase start/end and rate-limit changes as they happen"""
+    try:
+        after = int(last_event_id) if last_event_id else None
+    except ValueError:
+        after = None
     
+    async def stream():
+        # Subscribed here, so a client that is gone before streaming starts never leaks
+        client = events.subscribe(after)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                frames = await client.next_frames(EVENT_HEARTBEAT)
+                if client.dropped:
+                    return
+                yield "".join(frames) if frames else ": keep-alive\n\n"
+        finally:
+            events.unsubscribe(client)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============== Debug ==============
+
+def render_profile(profile: Profile, format: str):
+    return profile.to_collapsed() if format == "collapsed" else profile.to_speedscope()
+
+def profile_response(format: str, body):
+    if format == "collapsed":
+        return PlainTextResponse(body)
+    return JSONResponse(body)
+
+async def relay_profile(command: dict):
+    """Leader: take a profile requested by another worker and leave it in the coordination directory"""
+    path = Path(COORDINATION_DIR) / "profiles" / f"{command['id']}.json"
     try:
-        bot.farm_followers()
-        return MessageResponse(message="✅ Farming cycle completed")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        profile = await asyncio.get_running_loop().run_in_executor(None, profiler.profile, command['seconds'])
+        result = {"format": command['format'], "body": render_profile(profile, command['format'])}
+    except RuntimeError as e:
+        result = {"error": str(e)}
+    # Nobody waits for it anymore
+    if time.time() - command['sent_at'] > command['seconds'] + PROFILE_RELAY_MARGIN:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    await asyncio.get_running_loop().run_in_executor(None, lambda: atomic_write_json(path, result, indent=None))
+
+@app.get("/v1/debug/profile", tags=["Debug"], dependencies=[Depends(verify_api_key)])
+async def profile_bot(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$")
+):
+    """
+    Sample the bot threads for `seconds` (e.g. during a slow cycle): a speedscope file or
+    collapsed stacks, each stack under its category (cpu, json, github, telegram, wait)
+    """
+    if coordinator.is_leader:
+        try:
+            profile = await asyncio.get_running_loop().run_in_executor(None, profiler.profile, seconds)
+        except RuntimeError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        return profile_response(format, render_profile(profile, format))
+    
+    # The bot runs in the leader worker: it takes the profile and leaves it in the coordination directory
+    command_id = coordinator.commands.send('profile', seconds=seconds, format=format)
+    path = Path(COORDINATION_DIR) / "profiles" / f"{command_id}.json"
+    deadline = time.monotonic() + seconds + PROFILE_RELAY_MARGIN
+    while not path.exists():
+        if time.monotonic() > deadline:
+            raise HTTPException(status_code=504, detail="No profile from the leader worker")
+        await asyncio.sleep(0.2)
+    with open(path, "r") as f:
+        result = json.load(f)
+    path.unlink(missing_ok=True)
+    if "error" in result:
+        raise HTTPException(status_code=409, detail=result["error"])
+    return profile_response(result["format"], result["body"])
@@ -0,0 +1,69 @@
+"""
+GitHub Follower Bot - Action Journal
+Machine-readable JSONL record of every follow and unfollow the bot sends
+
+Created by: dewhush
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ActionJournal:
+    """
+    Append-only JSONL journal, one record per action:
+    {"ts", "action", "login", "outcome", "latency_ms"}.
+    Records are buffered and appended in one write once `buffer_size` records
+    are pending or the oldest is `flush_interval` seconds old, and on flush().
+    """
+
+    def __init__(self, path: Path, buffer_size: int = 100, flush_interval: float = 5.0):
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, action: str, login: str, outcome: str, latency: Optional[float] = None):
+        entry = {
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'action': action,
+            'login': login,
+            'outcome': outcome,
+            'latency_ms': round(latency * 1000, 1) if latency is not None else None,
+        }
+        with self._lock:
+            self._buffer.append(json.dumps(entry))
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            due = (len(self._buffer) >= self.buffer_size
+                   or time.monotonic() - self._oldest >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Append the buffered records to the journal file"""
+        with self._lock:
+            if not self._buffer:
+                return
+            lines, self._buffer, self._oldest = self._buffer, [], None
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+            except OSError as e:
+                # Keep the records for the next flush
+                self._buffer = lines + self._buffer
+                self._oldest = time.monotonic()
+                logger.error(f"❌ Failed to write action journal: {e}")
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,293 @@
+"""
+GitHub Follower Bot - Fake GitHub REST Server
+Local stand-in for the GitHub endpoints the bot uses, for offline benchmarks
+
+Created by: dewhush
+
+Run standalone:
+    python -m benchmarks.fake_github --followers 10000 --port 9000
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class Dataset:
+    """
+    Synthetic account: `followers` followers, `following` followed users of
+    which `overlap` (0..1) follow back, and `stargazers` per target repo.
+    """
+
+    def __init__(self, followers: int, following: int, overlap: float, stargazers: int):
+        self.me = 'bench-user'
+        self.followers = [f'fan{i:07d}' for i in range(followers)]
+        shared = int(min(following, followers) * overlap)
+        self.following = self.followers[:shared] + [f'idol{i:07d}' for i in range(following - shared)]
+        self.following_set = set(self.following)
+        self.stargazers = [f'star{i:07d}' for i in range(stargazers)]
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def add_followers(self, count: int):
+        """Prepend new followers (the API lists followers newest first)"""
+        with self.lock:
+            start = len(self.followers)
+            self.followers[:0] = [f'new{start + i:07d}' for i in range(count)]
+            self.version += 1
+
+    def follow(self, login: str):
+        with self.lock:
+            if login not in self.following_set:
+                self.following.insert(0, login)
+                self.following_set.add(login)
+                self.version += 1
+
+    def unfollow(self, login: str):
+        with self.lock:
+            if login in self.following_set:
+                self.following.remove(login)
+                self.following_set.discard(login)
+                self.version += 1
+
+
+class FakeGitHub:
+    """Threaded HTTP server answering a subset of the GitHub REST and GraphQL APIs"""
+
+    def __init__(self, dataset: Dataset, latency: float = 0.0, rate_limit: int = 1_000_000,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.dataset = dataset
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.stats = {'requests': 0, 'not_modified': 0, 'bytes_sent': 0, 'bytes_received': 0}
+        self.stats_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.base_url = f'http://{host}:{self.port}'
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_stats(self):
+        with self.stats_lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def record(self, sent: int, received: int, not_modified: bool, control: bool):
+        if control:
+            return
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            self.stats['bytes_sent'] += sent
+            self.stats['bytes_received'] += received
+            if not_modified:
+                self.stats['not_modified'] += 1
+            else:
+                self.remaining = max(0, self.remaining - 1)
+
+
+def _user(login: str, base_url: str) -> dict:
+    return {
+        'login': login,
+        'id': int(hashlib.md5(login.encode()).hexdigest()[:8], 16),
+        'type': 'User',
+        'url': f'{base_url}/users/{login}',
+        'html_url': f'https://github.com/{login}',
+        'avatar_url': f'https://avatars.githubusercontent.com/{login}',
+        'followers_url': f'{base_url}/users/{login}/followers',
+        'following_url': f'{base_url}/users/{login}/following{{/other_user}}',
+        'site_admin': False,
+    }
+
+
+def _make_handler(fake: FakeGitHub):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status: int, body=None, headers=None, control: bool = False):
+            data = json.dumps(body).encode() if body is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('X-RateLimit-Limit', str(fake.rate_limit))
+            self.send_header('X-RateLimit-Remaining', str(fake.remaining))
+            self.send_header('X-RateLimit-Reset', str(fake.reset_at))
+            self.send_header('X-RateLimit-Resource', 'graphql' if self.path == '/graphql' else 'core')
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+            fake.record(len(data), self._received, status == 304, control)
+
+        def _read_body(self) -> bytes:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            self._received = length + len(self.requestline)
+            return body
+
+        def _page(self, path: str, query: dict, items: list):
+            per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+            page = max(int(query.get('page', ['1'])[0]), 1)
+            with fake.dataset.lock:
+                chunk = items[(page - 1) * per_page:page * per_page]
+                total = len(items)
+            last = max((total + per_page - 1) // per_page, 1)
+            etag = '"' + hashlib.md5('\n'.join(chunk).encode()).hexdigest() + '"'
+            links = []
+            if page < last:
+                links.append(f'<{fake.base_url}{path}?per_page={per_page}&page={page + 1}>; rel="next"')
+                links.append(f'<{fake.base_url}{path}?per_page={per_page}&page={last}>; rel="last"')
+            if page > 1:
+                links.append(f'<{fake.base_url}{path}?per_page={per_page}&page={page - 1}>; rel="prev"')
+                links.append(f'<{fake.base_url}{path}?per_page={per_page}&page=1>; rel="first"')
+            headers = {'ETag': etag}
+            if links:
+                headers['Link'] = ', '.join(links)
+            if self.headers.get('If-None-Match') == etag:
+                return self._reply(304, headers=headers)
+            self._reply(200, [_user(login, fake.base_url) for login in chunk], headers)
+
+        def _graphql(self, body: bytes):
+            """Login-only viewer followers/following connections, as the bot queries them"""
+            request = json.loads(body or b'{}')
+            match = re.search(r'\b(followers|following)\s*\(', request.get('query', ''))
+            if not match:
+                return self._reply(200, {'errors': [{'message': 'Unsupported query'}]})
+            variables = request.get('variables') or {}
+            first = min(int(variables.get('first') or 100), 100)
+            start = int(variables.get('after') or 0)
+            with fake.dataset.lock:
+                items = getattr(fake.dataset, match.group(1))
+                chunk = items[start:start + first]
+                total = len(items)
+            end = start + len(chunk)
+            self._reply(200, {'data': {'viewer': {match.group(1): {
+                'pageInfo': {'hasNextPage': end < total, 'endCursor': str(end)},
+                'nodes': [{'login': login} for login in chunk],
+            }}}})
+
+        def _delay(self):
+            if fake.latency:
+                time.sleep(fake.latency)
+
+        def do_GET(self):
+            self._read_body()
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            path = url.path
+            data = fake.dataset
+
+            if path == '/_bench/stats':
+                return self._reply(200, dict(fake.stats, rate_remaining=fake.remaining), control=True)
+
+            self._delay()
+            if path == '/user':
+                return self._reply(200, _user(data.me, fake.base_url))
+            if path == '/rate_limit':
+                core = {'limit': fake.rate_limit, 'remaining': fake.remaining, 'reset': fake.reset_at}
+                return self._reply(200, {'resources': {'core': core}, 'rate': core})
+            if path in ('/user/followers', f'/users/{data.me}/followers'):
+                return self._page(path, query, data.followers)
+            if path in ('/user/following', f'/users/{data.me}/following'):
+                return self._page(path, query, data.following)
+            match = re.match(r'^/repos/([^/]+)/([^/]+)(/stargazers)?$', path)
+            if match:
+                if match.group(3):
+                    return self._page(path, query, data.stargazers)
+                full_name = f'{match.group(1)}/{match.group(2)}'
+                return self._reply(200, {
+                    'id': 1, 'name': match.group(2), 'full_name': full_name,
+                    'url': f'{fake.base_url}/repos/{full_name}',
+                    'stargazers_url': f'{fake.base_url}/repos/{full_name}/stargazers',
+                })
+            match = re.match(r'^/users/([^/]+)$', path)
+            if match:
+                return self._reply(200, _user(match.group(1), fake.base_url))
+            self._reply(404, {'message': 'Not Found'})
+
+        def do_PUT(self):
+            self._read_body()
+            self._delay()
+            match = re.match(r'^/user/following/([^/]+)$', self.path)
+            if not match:
+                return self._reply(404, {'message': 'Not Found'})
+            fake.dataset.follow(match.group(1))
+            self._reply(204)
+
+        def do_DELETE(self):
+            self._read_body()
+            self._delay()
+            match = re.match(r'^/user/following/([^/]+)$', self.path)
+            if not match:
+                return self._reply(404, {'message': 'Not Found'})
+            fake.dataset.unfollow(match.group(1))
+            self._reply(204)
+
+        def do_POST(self):
+            body = self._read_body()
+            if self.path == '/_bench/reset':
+                fake.reset_stats()
+                return self._reply(200, {'ok': True}, control=True)
+            if self.path == '/_bench/add-followers':
+                count = json.loads(body or b'{}').get('count', 1)
+                fake.dataset.add_followers(count)
+                return self._reply(200, {'ok': True}, control=True)
+            self._delay()
+            if self.path == '/graphql':
+                return self._graphql(body)
+            self._reply(404, {'message': 'Not Found'})
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fake GitHub REST server for benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--followers', type=int, default=1000)
+    parser.add_argument('--following', type=int, default=None, help='defaults to --followers')
+    parser.add_argument('--overlap', type=float, default=0.9, help='share of following that follows back')
+    parser.add_argument('--stargazers', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    dataset = Dataset(
+        args.followers,
+        args.following if args.following is not None else args.followers,
+        args.overlap,
+        args.stargazers,
+    )
+    fake = FakeGitHub(dataset, args.latency_ms / 1000, args.rate_limit, args.host, args.port)
+    # The benchmark runner reads the URL from the first line of output
+    print(fake.base_url, flush=True)
+    try:
+        fake.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,454 @@
+"""
+GitHub Follower Bot - API Load Test
+Drives the FastAPI app with concurrent clients, idle and while cycles run
+
+Created by: dewhush
+
+Usage:
+    python -m benchmarks.loadtest --concurrency 32 --duration 10 --output loadtest.json
+    python -m benchmarks.loadtest --mode uvicorn --mix health=1,status=4,config=1
+    python -m benchmarks.loadtest --compare loadtest.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.run import FakeServerProcess, git_commit
+
+API_KEY = 'loadtest-key'
+
+ENDPOINTS = {
+    'health': '/health',
+    'ready': '/ready',
+    'status': '/status',
+    'config': '/v1/config',
+    'metrics': '/metrics',
+}
+
+LAG_PROBE_INTERVAL = 0.01
+
+
+# ============== Clients ==============
+
+class ASGIClient:
+    """Calls the ASGI app directly on the running event loop (no sockets)"""
+
+    def __init__(self, app, headers: Dict[str, str]):
+        self.app = app
+        self.headers = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+
+    async def request(self, method: str, target: str) -> int:
+        # Yield like a socket read would, or the clients would starve the loop
+        await asyncio.sleep(0)
+        path, _, query = target.partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': method, 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': query.encode(), 'root_path': '', 'headers': self.headers,
+            'client': ('127.0.0.1', 50000), 'server': ('127.0.0.1', 80),
+        }
+        sent_body = False
+        status = 0
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Only streaming responses ask again, to notice a disconnect
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        await self.app(scope, receive, send)
+        return status
+
+    async def close(self):
+        pass
+
+
+class HTTPClient:
+    """One keep-alive HTTP/1.1 connection (Content-Length responses only)"""
+
+    def __init__(self, host: str, port: int, headers: Dict[str, str]):
+        self.host = host
+        self.port = port
+        self.extra = ''.join(f'{k}: {v}\r\n' for k, v in headers.items())
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, target: str) -> int:
+        while True:
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await self._exchange(method, target)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                # The server closed an idle keep-alive connection: retry on a new one
+                if not reused:
+                    raise
+            except Exception:
+                await self.close()
+                raise
+
+    async def _exchange(self, method: str, target: str) -> int:
+        self.writer.write(
+            f'{method} {target} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n'
+            f'{self.extra}Content-Length: 0\r\n\r\n'.encode()
+        )
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by the server')
+        status = int(status_line.split()[1])
+        length, close = 0, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection' and 'close' in value.lower():
+                close = True
+        await self.reader.readexactly(length)
+        if close:
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = self.reader = None
+
+
+# ============== Measurement ==============
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _ms(values: List[float]) -> dict:
+    return {
+        name: round(value * 1000, 3) if value is not None else None
+        for name, value in (
+            ('p50', percentile(values, 0.50)),
+            ('p90', percentile(values, 0.90)),
+            ('p99', percentile(values, 0.99)),
+            ('max', max(values) if values else None),
+        )
+    }
+
+
+async def probe_loop_lag(seconds: float, warmup: float) -> List[float]:
+    """How late short sleeps wake up on the event loop it runs on (after `warmup`)"""
+    loop = asyncio.get_running_loop()
+    lags = []
+    started = loop.time()
+    while loop.time() - started < seconds:
+        before = loop.time()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        if before - started >= warmup:
+            lags.append(max(0.0, loop.time() - before - LAG_PROBE_INTERVAL))
+    return lags
+
+
+def parse_mix(mix: str) -> List[Tuple[str, float]]:
+    """"health=1,status=2" -> [('health', 1.0), ('status', 2.0)]"""
+    weights = []
+    for part in mix.split(','):
+        name, _, weight = part.strip().partition('=')
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        weights.append((name, float(weight or 1)))
+    return weights
+
+
+async def drive(make_client: Callable, mix: List[Tuple[str, float]], concurrency: int,
+                duration: float, warmup: float, seed: int) -> dict:
+    """`concurrency` clients sending back-to-back requests for `warmup + duration` seconds"""
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    statuses: Dict[str, Counter] = {name: Counter() for name in names}
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def client_loop(index: int):
+        rng = random.Random(seed + index)
+        client = make_client()
+        try:
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                sent = time.perf_counter()
+                try:
+                    status = await client.request('GET', ENDPOINTS[name])
+                except Exception as e:
+                    status = type(e).__name__
+                if sent >= measure_from:
+                    latencies[name].append(time.perf_counter() - sent)
+                    statuses[name][str(status)] += 1
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+    return {'latencies': latencies, 'statuses': statuses, 'elapsed': time.perf_counter() - measure_from}
+
+
+def summarize(scenario: str, measured: dict, lags: List[float], bot_activity: dict, args) -> dict:
+    elapsed = measured['elapsed']
+    all_latencies = [value for values in measured['latencies'].values() for value in values]
+    errors = sum(
+        count for counter in measured['statuses'].values()
+        for status, count in counter.items() if not status.isdigit() or int(status) >= 500
+    )
+    return {
+        'scenario': scenario,
+        'mode': args.mode,
+        'concurrency': args.concurrency,
+        'duration_seconds': round(elapsed, 3),
+        'requests': len(all_latencies),
+        'errors': errors,
+        'rps': round(len(all_latencies) / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': _ms(all_latencies),
+        'loop_lag_ms': _ms(lags),
+        'bot': bot_activity,
+        'endpoints': {
+            name: dict(
+                requests=len(values),
+                rps=round(len(values) / elapsed, 1) if elapsed else 0.0,
+                statuses=dict(measured['statuses'][name]),
+                **_ms(values)
+            )
+            for name, values in measured['latencies'].items()
+        },
+    }
+
+
+# ============== Scenarios ==============
+
+def loadtest_config(args) -> dict:
+    return {
+        # Back-to-back cycles in the "cycle" scenario
+        'check_interval_seconds': 0,
+        'cleanup_non_followers': True,
+        'github_client': {'seconds_between_requests': None, 'seconds_between_writes': None},
+        'farming': {
+            'enabled': True,
+            'target_repos': ['bench/repo'],
+            'hourly_follow_limit': 10 ** 9,
+            'daily_follow_limit': 10 ** 9,
+        },
+        'logging': {'level': 'WARNING', 'file': None, 'journal': None},
+    }
+
+
+async def wait_ready(client, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while await client.request('GET', '/ready') != 200:
+        if time.monotonic() > deadline:
+            raise RuntimeError('API not ready (bot warm-up failed?)')
+        await asyncio.sleep(0.1)
+
+
+async def run_scenarios(api, make_client: Callable, lag_probe: Callable, args) -> List[dict]:
+    """Load the API idle, then while cycles run back to back"""
+    mix = parse_mix(args.mix)
+    control = make_client()
+    await wait_ready(control)
+    # Measure the API, not the politeness pauses between bot actions
+    bot = api.bot
+    bot._wait = lambda seconds: not bot.cancelled
+    bot.rate_limiter.wait = bot._wait
+
+    results = []
+    for scenario in args.scenarios.split(','):
+        print(f"▶️ {scenario}: {args.concurrency} clients, {args.duration}s ({args.mode})", flush=True)
+        if scenario == 'cycle':
+            await control.request('POST', '/v1/start')
+        cycles_before, calls_before = api.scheduler.cycles, bot.api_calls
+        lags, measured = await asyncio.gather(
+            lag_probe(args.warmup + args.duration, args.warmup),
+            drive(make_client, mix, args.concurrency, args.duration, args.warmup, args.seed),
+        )
+        if scenario == 'cycle':
+            await control.request('POST', '/v1/stop')
+            # Let the interrupted cycle wind down before the next scenario
+            while api.worker.busy:
+                await asyncio.sleep(0.05)
+        bot_activity = {
+            # Including the one interrupted at the end
+            'cycles': api.scheduler.cycles - cycles_before,
+            'github_requests': bot.api_calls - calls_before,
+        }
+        results.append(summarize(scenario, measured, lags, bot_activity, args))
+    await control.close()
+    return results
+
+
+async def run_inprocess(api, args) -> List[dict]:
+    """App, clients and lag probe share one event loop, as in a single uvicorn worker"""
+    headers = {'X-API-Key': API_KEY}
+    async with api.app.router.lifespan_context(api.app):
+        return await run_scenarios(api, lambda: ASGIClient(api.app, headers), probe_loop_lag, args)
+
+
+def run_uvicorn(api, args) -> List[dict]:
+    """Real uvicorn server on a local port, in a thread with its own event loop"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(api.app, host='127.0.0.1', port=args.port, log_level='warning'))
+    server_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=server_loop.run_until_complete, args=(server.serve(),), daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError('uvicorn failed to start')
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    headers = {'X-API-Key': API_KEY}
+
+    async def lag_probe(seconds: float, warmup: float) -> List[float]:
+        # Measured on the server's loop, not on the clients' one
+        future = asyncio.run_coroutine_threadsafe(probe_loop_lag(seconds, warmup), server_loop)
+        return await asyncio.wrap_future(future)
+
+    try:
+        return asyncio.run(run_scenarios(api, lambda: HTTPClient('127.0.0.1', port, headers), lag_probe, args))
+    finally:
+        server.should_exit = True
+        thread.join(timeout=30)
+
+
+# ============== Reporting ==============
+
+def compare(results: List[dict], baseline_path: Path, threshold: float) -> bool:
+    """Print a comparison with a previous run; returns False on regressions"""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(r['mode'], r['scenario']): r for r in baseline['results']}
+    ok = True
+    print(f"\nComparison with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    for result in results:
+        old = previous.get((result['mode'], result['scenario']))
+        if not old:
+            continue
+        checks = (
+            # (metric, before, after, higher is better)
+            ('rps', old['rps'], result['rps'], True),
+            ('p99_ms', old['latency_ms']['p99'] or 0, result['latency_ms']['p99'] or 0, False),
+            ('loop_lag_p99_ms', old['loop_lag_ms']['p99'] or 0, result['loop_lag_ms']['p99'] or 0, False),
+        )
+        for metric, before, after, higher_is_better in checks:
+            change = (after - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            # Sub-millisecond latency moves are noise
+            regressed = worse > threshold and (higher_is_better or after - before >= 1.0)
+            flag = '❌' if regressed else '  '
+            ok = ok and not regressed
+            print(f"{flag} {result['mode']:<9} {result['scenario']:<6} {metric:<16} "
+                  f"{before:>10} -> {after:<10} ({change:+.1%})")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Load test of the API against a fake GitHub server')
+    parser.add_argument('--mode', choices=['inprocess', 'uvicorn'], default='inprocess',
+                        help='call the ASGI app directly, or through uvicorn on a local port')
+    parser.add_argument('--scenarios', default='idle,cycle', help='idle and/or cycle (cycles running back to back)')
+    parser.add_argument('--mix', default='health=1,status=1,config=1',
+                        help=f"endpoint weights, from: {', '.join(ENDPOINTS)}")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0, help='measured seconds per scenario')
+    parser.add_argument('--warmup', type=float, default=1.0, help='unmeasured seconds before each scenario')
+    parser.add_argument('--followers', type=int, default=5000, help='size of the fake GitHub account')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='fake GitHub response latency')
+    parser.add_argument('--port', type=int, default=0, help='uvicorn port (0 = any free port)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='loadtest_results.json')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed relative regression')
+    args = parser.parse_args(argv)
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = FakeServerProcess(
+        followers=args.followers, following=args.followers, overlap=0.9, stargazers=1000,
+        latency_ms=args.latency_ms,
+    )
+    previous_cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory(prefix='loadtest-') as tmp:
+            os.chdir(tmp)
+            Path('config.json').write_text(json.dumps(loadtest_config(args)))
+            os.environ.update({
+                'GITHUB_TOKEN': 'loadtest-token',
+                'GITHUB_API_URL': server.base_url,
+                'API_KEY': API_KEY,
+                'COORDINATION_DIR': str(Path(tmp) / '.coordination'),
+                # Set (empty) so a .env file cannot enable real notifications
+                'TELEGRAM_BOT_TOKEN': '',
+            })
+            # Reads its configuration from the environment on import; its startup configures logging
+            import api
+
+            if args.mode == 'inprocess':
+                results = asyncio.run(run_inprocess(api, args))
+            else:
+                results = run_uvicorn(api, args)
+    finally:
+        os.chdir(previous_cwd)
+        server.stop()
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    for r in results:
+        print(f"{r['mode']:<9} {r['scenario']:<6} {r['rps']:>9.1f} req/s  "
+              f"p50 {r['latency_ms']['p50']} ms  p99 {r['latency_ms']['p99']} ms  "
+              f"loop lag p99 {r['loop_lag_ms']['p99']} ms  errors {r['errors']}  bot requests {r['bot']['github_requests']}")
+    print(f"💾 Results saved to {args.output}")
+
+    if args.compare:
+        return 0 if compare(results, Path(args.compare), args.threshold) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+GitHub Follower Bot - Record/Replay Runs
+Records real GitHub/Telegram traffic to a cassette, then replays it offline
+to profile the bot and catch regressions in request count or CPU time
+
+Created by: dewhush
+
+Usage:
+    # In the bot's working directory (needs GITHUB_TOKEN, network access)
+    python -m benchmarks.replay record --cassette prod.jsonl.gz
+
+    # Anywhere, offline
+    python -m benchmarks.replay replay --cassette prod.jsonl.gz --output replay.json
+    python -m benchmarks.replay replay --cassette prod.jsonl.gz --compare replay.json
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from cassette import Cassette
+from core import GitHubFollowerBot
+
+PHASES = {
+    'follow_back': 'check_and_follow_back',
+    'cleanup': 'cleanup_non_followers',
+    'report': 'send_session_report',
+}
+DEFAULT_PHASES = 'follow_back,cleanup,report'
+STATE_PATTERNS = ('*.json', '*.db')  # databases are copied through the SQLite backup API
+COMPARED_METRICS = ('requests', 'cpu_seconds')
+
+
+# ============== State Snapshots ==============
+
+def _snapshot_dir(cassette: Path) -> Path:
+    return cassette.with_name(cassette.name + '.state')
+
+
+def snapshot_state(source: Path, target: Path):
+    """Copy the bot state files so a replay starts from the recorded state"""
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True)
+    for pattern in STATE_PATTERNS:
+        for path in source.glob(pattern):
+            if not path.is_file():
+                continue
+            if path.suffix == '.db':
+                _backup_database(path, target / path.name)
+            else:
+                shutil.copy2(path, target / path.name)
+
+
+def _backup_database(source: Path, target: Path):
+    """Consistent copy of a (WAL mode) database, including commits still in its -wal file"""
+    src = sqlite3.connect(source)
+    try:
+        dst = sqlite3.connect(target)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+def _bot_config(state_dir: Path, cassette: dict, pacing: bool = True) -> Path:
+    config_file = state_dir / 'config.json'
+    config = json.loads(config_file.read_text()) if config_file.exists() else {}
+    config['cassette'] = cassette
+    if not pacing:
+        config['github_client'] = dict(
+            config.get('github_client', {}), seconds_between_requests=None, seconds_between_writes=None
+        )
+    path = state_dir / '.replay-config.json'
+    path.write_text(json.dumps(config))
+    return path
+
+
+def _run_phases(bot: GitHubFollowerBot, phases: List[str]) -> dict:
+    timings = {}
+    for phase in phases:
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        getattr(bot, PHASES[phase])()
+        timings[phase] = {
+            'wall_seconds': round(time.perf_counter() - started, 4),
+            'cpu_seconds': round(time.process_time() - cpu_started, 4),
+        }
+    return timings
+
+
+# ============== Record ==============
+
+def record(args) -> int:
+    cassette_path = Path(args.cassette).resolve()
+    state_dir = Path(args.state_dir).resolve()
+    phases = args.phases.split(',')
+
+    snapshot_state(state_dir, _snapshot_dir(cassette_path))
+    previous_cwd = os.getcwd()
+    os.chdir(state_dir)
+    try:
+        config_path = _bot_config(state_dir, {'mode': 'record', 'path': str(cassette_path)})
+        bot = GitHubFollowerBot(str(config_path))
+        try:
+            _run_phases(bot, phases)
+        finally:
+            bot.close()
+            config_path.unlink()
+    finally:
+        os.chdir(previous_cwd)
+
+    print(f"📼 Recorded {len(bot.cassette.exchanges)} exchanges to {cassette_path}")
+    print(f"💾 State snapshot in {_snapshot_dir(cassette_path)}")
+    return 0
+
+
+# ============== Replay ==============
+
+def _replay_environment(cassette_path: Path):
+    """Point the bot at the recorded API host and fake the credentials"""
+    cassette = Cassette(cassette_path, 'replay')
+    # Pagination links are absolute, so the base URL must match the recording
+    base_url = cassette.meta.get('base_url')
+    if base_url:
+        os.environ['GITHUB_API_URL'] = base_url
+    os.environ.setdefault('GITHUB_TOKEN', 'replay-token')
+    if any('api.telegram.org' in e['url'] for e in cassette.exchanges):
+        # Any token will do, it is redacted in the cassette
+        os.environ.setdefault('TELEGRAM_BOT_TOKEN', 'replay')
+        os.environ.setdefault('TELEGRAM_CHAT_ID', 'replay')
+    else:
+        os.environ.pop('TELEGRAM_BOT_TOKEN', None)
+
+
+def replay(args) -> dict:
+    """Replay a cassette from its state snapshot and measure the run"""
+    cassette_path = Path(args.cassette).resolve()
+    phases = args.phases.split(',')
+    snapshot = _snapshot_dir(cassette_path)
+
+    previous_cwd = os.getcwd()
+    previous_env = dict(os.environ)
+    with tempfile.TemporaryDirectory(prefix='replay-') as tmp:
+        state_dir = Path(tmp)
+        if snapshot.exists():
+            for path in snapshot.iterdir():
+                shutil.copy2(path, state_dir / path.name)
+        os.chdir(state_dir)
+        _replay_environment(cassette_path)
+        try:
+            config_path = _bot_config(
+                state_dir, {'mode': 'replay', 'path': str(cassette_path), 'speed': args.speed}, pacing=False
+            )
+            bot = GitHubFollowerBot(str(config_path))
+            # Politeness pauses are not part of the recorded traffic
+            bot._wait = lambda seconds: not bot.cancelled
+            bot.rate_limiter.wait = bot._wait
+
+            profiler = cProfile.Profile()
+            cpu_started = time.process_time()
+            started = time.perf_counter()
+            profiler.enable()
+            timings = _run_phases(bot, phases)
+            profiler.disable()
+            wall = time.perf_counter() - started
+            cpu = time.process_time() - cpu_started
+            bot.close()
+        finally:
+            os.chdir(previous_cwd)
+            os.environ.clear()
+            os.environ.update(previous_env)
+
+    if args.profile:
+        profiler.dump_stats(args.profile)
+    top = io.StringIO()
+    pstats.Stats(profiler, stream=top).sort_stats('cumulative').print_stats(args.top)
+
+    stats = bot.cassette.stats()
+    return {
+        'meta': {
+            'cassette': str(cassette_path),
+            'speed': args.speed,
+            'phases': phases,
+            'timestamp': datetime.now().isoformat(),
+        },
+        'requests': stats['replayed'],
+        'misses': stats['misses'],
+        'unused': stats['unused'],
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'phases': timings,
+        'profile': top.getvalue(),
+    }
+
+
+def compare(result: dict, baseline_path: Path, threshold: float) -> bool:
+    """Print a comparison with a previous replay; returns False on regressions"""
+    baseline = json.loads(baseline_path.read_text())
+    ok = result['misses'] == 0
+    if not ok:
+        print(f"❌ {result['misses']} requests were not in the cassette")
+    print(f"\nComparison with {baseline_path}:")
+    for metric in COMPARED_METRICS:
+        before, after = baseline.get(metric) or 0, result.get(metric) or 0
+        change = (after - before) / before if before else (1.0 if after else 0.0)
+        regressed = change > threshold and not (metric == 'cpu_seconds' and after - before < 0.05)
+        ok = ok and not regressed
+        print(f"{'❌' if regressed else '  '} {metric:<13} {before:>10} -> {after:<10} ({change:+.1%})")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Record and replay bot traffic')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='run the bot against GitHub and record a cassette')
+    rec.add_argument('--cassette', required=True)
+    rec.add_argument('--state-dir', default='.', help="bot working directory (config and state files)")
+    rec.add_argument('--phases', default=DEFAULT_PHASES, help=f"comma separated, from {', '.join(PHASES)}")
+
+    rep = sub.add_parser('replay', help='replay a cassette offline and report CPU time and requests')
+    rep.add_argument('--cassette', required=True)
+    rep.add_argument('--phases', default=DEFAULT_PHASES)
+    rep.add_argument('--speed', choices=['fast', 'recorded'], default='fast')
+    rep.add_argument('--output', help='write the report as JSON')
+    rep.add_argument('--profile', help='write cProfile stats to this file')
+    rep.add_argument('--top', type=int, default=25, help='functions listed in the profile summary')
+    rep.add_argument('--compare', help='previous replay report to compare against')
+    rep.add_argument('--threshold', type=float, default=0.10, help='allowed relative regression')
+    for command in (rec, rep):
+        command.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    if args.command == 'record':
+        return record(args)
+
+    result = replay(args)
+    print(result['profile'] if args.verbose else '', end='')
+    print(f"🔁 {result['requests']} requests replayed, {result['misses']} misses, "
+          f"{result['unused']} unused; {result['wall_seconds']}s wall, {result['cpu_seconds']}s CPU")
+    for phase, timing in result['phases'].items():
+        print(f"   {phase:<12} {timing['wall_seconds']:>8.3f}s wall {timing['cpu_seconds']:>8.3f}s CPU")
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+        print(f"💾 Results saved to {args.output}")
+    if args.compare:
+        return 0 if compare(result, Path(args.compare), args.threshold) else 1
+    return 1 if result['misses'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
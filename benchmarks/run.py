@@ -0,0 +1,306 @@
+"""
+GitHub Follower Bot - Offline Benchmarks
+Runs the bot against the local fake GitHub server and reports performance
+
+Created by: dewhush
+
+Usage:
+    python -m benchmarks.run --sizes 1000,10000 --output bench_results.json
+    python -m benchmarks.run --sizes 1000 --compare bench_results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from core import GitHubFollowerBot
+
+COMPARED_METRICS = ('requests', 'bytes_sent', 'wall_seconds')
+
+
+# ============== Fake Server Process ==============
+
+class FakeServerProcess:
+    """Fake GitHub server in a child process, so it does not skew our RSS"""
+
+    def __init__(self, followers: int, following: int, overlap: float, stargazers: int, latency_ms: float):
+        self.proc = subprocess.Popen(
+            [
+                sys.executable, '-m', 'benchmarks.fake_github',
+                '--followers', str(followers),
+                '--following', str(following),
+                '--overlap', str(overlap),
+                '--stargazers', str(stargazers),
+                '--latency-ms', str(latency_ms),
+            ],
+            cwd=str(REPO_ROOT),
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.base_url = self.proc.stdout.readline().strip()
+        if not self.base_url:
+            raise RuntimeError('Fake GitHub server failed to start')
+
+    def _call(self, method: str, path: str, body: Optional[dict] = None) -> dict:
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method)
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())
+
+    def stats(self) -> dict:
+        return self._call('GET', '/_bench/stats')
+
+    def reset(self):
+        self._call('POST', '/_bench/reset', {})
+
+    def add_followers(self, count: int):
+        self._call('POST', '/_bench/add-followers', {'count': count})
+
+    def stop(self):
+        self.proc.terminate()
+        self.proc.wait(timeout=10)
+
+
+# ============== Measurement ==============
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _proc_write_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                if line.startswith('wchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _file_snapshot(directory: Path) -> Dict[str, tuple]:
+    snapshot = {}
+    for path in directory.iterdir():
+        if path.is_file():
+            stat = path.stat()
+            snapshot[path.name] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def measure(name: str, fn: Callable, server: FakeServerProcess, state_dir: Path) -> dict:
+    """Run `fn` once and collect wall/CPU time, HTTP traffic, memory and state-file I/O"""
+    server.reset()
+    files_before = _file_snapshot(state_dir)
+    wchar_before = _proc_write_bytes()
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+
+    fn()
+
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    wchar_after = _proc_write_bytes()
+    files_after = _file_snapshot(state_dir)
+    stats = server.stats()
+
+    changed = [n for n, v in files_after.items() if files_before.get(n) != v]
+    return {
+        'scenario': name,
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'requests': stats['requests'],
+        'not_modified': stats['not_modified'],
+        'bytes_sent': stats['bytes_sent'],
+        'bytes_received': stats['bytes_received'],
+        'peak_rss_mb': _peak_rss_mb(),
+        'state_files_written': len(changed),
+        'state_bytes_written': sum(files_after[n][0] for n in changed),
+        'process_write_bytes': (wchar_after - wchar_before) if wchar_before is not None else None,
+    }
+
+
+# ============== Scenarios ==============
+
+def bench_config(args) -> dict:
+    return {
+        'cleanup_non_followers': True,
+        'state_backend': args.state_backend,
+        'listing': {'mode': args.listing},
+        'low_memory': {
+            'enabled': bool(args.max_logins_in_memory),
+            'max_logins_in_memory': args.max_logins_in_memory,
+        },
+        # PyGithub paces requests (0.25s) and writes (1s) by default; --pacing keeps that
+        'github_client': {} if args.pacing else {
+            'seconds_between_requests': None,
+            'seconds_between_writes': None,
+        },
+        'farming': {
+            'enabled': True,
+            'target_repos': ['bench/repo'],
+            'hourly_follow_limit': 10 ** 9,
+            'daily_follow_limit': 10 ** 9,
+        },
+    }
+
+
+def run_size(size: int, args) -> List[dict]:
+    """Run every scenario against a fresh account of `size` followers"""
+    server = FakeServerProcess(
+        followers=size,
+        following=int(size * args.following_ratio),
+        overlap=args.overlap,
+        stargazers=args.stargazers,
+        latency_ms=args.latency_ms,
+    )
+    previous_cwd = os.getcwd()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+            state_dir = Path(tmp)
+            os.chdir(state_dir)
+            (state_dir / 'config.json').write_text(json.dumps(bench_config(args)))
+            os.environ['GITHUB_TOKEN'] = 'bench-token'
+            os.environ['GITHUB_API_URL'] = server.base_url
+            os.environ.pop('TELEGRAM_BOT_TOKEN', None)
+
+            holder = {}
+
+            def startup():
+                holder['bot'] = GitHubFollowerBot()
+                holder['bot'].warm_up()
+
+            results.append(measure('startup', startup, server, state_dir))
+            bot = holder['bot']
+            # Measure the code, not the politeness pauses between actions
+            bot._wait = lambda seconds: not bot.cancelled
+            bot.rate_limiter.wait = bot._wait
+
+            results.append(measure('cycle_cold', bot.run_cycle, server, state_dir))
+            results.append(measure('cycle_warm', bot.run_cycle, server, state_dir))
+            if args.new_followers:
+                server.add_followers(args.new_followers)
+                results.append(measure('cycle_new_followers', bot.run_cycle, server, state_dir))
+            results.append(measure('follow_back', bot.check_and_follow_back, server, state_dir))
+            results.append(measure('farm', bot.farm_followers, server, state_dir))
+            results.append(measure('cleanup', bot.cleanup_non_followers, server, state_dir))
+            results.append(measure('flush', lambda: bot.flush_state(force=True), server, state_dir))
+            bot.close()
+    finally:
+        os.chdir(previous_cwd)
+        server.stop()
+
+    for result in results:
+        result['size'] = size
+    return results
+
+
+# ============== Reporting ==============
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=str(REPO_ROOT), text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[dict], baseline_path: Path, threshold: float) -> bool:
+    """Print a comparison with a previous run; returns False on regressions"""
+    baseline = json.loads(baseline_path.read_text())
+    previous = {(r['size'], r['scenario']): r for r in baseline['results']}
+    ok = True
+    print(f"\nComparison with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    for result in results:
+        old = previous.get((result['size'], result['scenario']))
+        if not old:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = old.get(metric) or 0, result.get(metric) or 0
+            change = (after - before) / before if before else (1.0 if after else 0.0)
+            regressed = change > threshold and not (metric == 'wall_seconds' and after - before < 0.05)
+            flag = '❌' if regressed else '  '
+            ok = ok and not regressed
+            print(f"{flag} {result['size']:>9} {result['scenario']:<20} {metric:<13} "
+                  f"{before:>12} -> {after:<12} ({change:+.1%})")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Offline benchmarks against a fake GitHub server')
+    parser.add_argument('--sizes', default='1000,10000', help='comma separated follower counts (up to 1000000)')
+    parser.add_argument('--following-ratio', type=float, default=1.0)
+    parser.add_argument('--overlap', type=float, default=0.9)
+    parser.add_argument('--stargazers', type=int, default=1000)
+    parser.add_argument('--new-followers', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--state-backend', choices=['json', 'sqlite'], default='sqlite')
+    parser.add_argument('--listing', choices=['rest', 'graphql'], default='rest')
+    parser.add_argument('--max-logins-in-memory', type=int, default=0,
+                        help='enable low-memory cleanup with this spill threshold (0 = off)')
+    parser.add_argument('--pacing', action='store_true', help="keep PyGithub's default request pacing")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed relative regression')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(',') if s.strip()):
+        print(f"▶️ Benchmarking {size} followers...", flush=True)
+        results.extend(run_size(size, args))
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    for r in results:
+        print(f"{r['size']:>9} {r['scenario']:<20} {r['wall_seconds']:>8.3f}s "
+              f"{r['requests']:>6} req {r['bytes_sent']:>11} B  rss {r['peak_rss_mb']} MB  "
+              f"state {r['state_bytes_written']} B")
+    print(f"💾 Results saved to {args.output}")
+
+    if args.compare:
+        return 0 if compare(results, Path(args.compare), args.threshold) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+GitHub Follower Bot - Record/Replay Transport
+Records HTTP exchanges to a compact cassette file and replays them offline
+
+Created by: dewhush
+"""
+
+import gzip
+import json
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from transport import Request, Response
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+# Only the headers the bot actually reads are kept, to keep cassettes small
+KEPT_RESPONSE_HEADERS = {
+    'content-type', 'etag', 'link', 'location', 'retry-after',
+    'x-ratelimit-limit', 'x-ratelimit-remaining', 'x-ratelimit-reset',
+    'x-ratelimit-resource', 'x-ratelimit-used', 'x-oauth-scopes',
+}
+
+_TELEGRAM_TOKEN = re.compile(r'/bot[^/]+/')
+
+
+class CassetteMiss(Exception):
+    """Raised when replay has no recorded exchange for a request"""
+
+
+def _redact_url(url: str) -> str:
+    return _TELEGRAM_TOKEN.sub('/bot<token>/', url)
+
+
+def _body_text(body) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        return body.decode('utf-8', errors='replace')
+    if isinstance(body, str):
+        return body
+    return None  # streamed uploads are not recorded
+
+
+class Cassette:
+    """
+    A gzip-compressed JSON Lines file of request/response exchanges.
+    The first line is a header; every following line is one exchange with
+    its start offset and duration, so replays can reproduce the timing.
+    """
+
+    def __init__(self, path: Path, mode: str, speed: str = 'fast', meta: Optional[dict] = None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        # Stored in the header, e.g. the API base URL replays must reuse
+        self.meta = dict(meta or {})
+        self.started = time.monotonic()
+        self.exchanges: List[dict] = []
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._queues: Dict[tuple, Deque[dict]] = defaultdict(deque)
+        if mode == 'replay':
+            self._load()
+
+    # ============== Storage ==============
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get('version') != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version: {header.get('version')}")
+            self.meta = header.get('meta', {})
+            for line in f:
+                exchange = json.loads(line)
+                self.exchanges.append(exchange)
+                self._queues[(exchange['method'], exchange['url'])].append(exchange)
+        logger.info(f"📼 Loaded {len(self.exchanges)} exchanges from {self.path}")
+
+    def save(self):
+        """Write the recorded exchanges (record mode only)"""
+        if self.mode != 'record':
+            return
+        with self._lock:
+            exchanges = list(self.exchanges)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            header = {'version': CASSETTE_VERSION, 'created': datetime.now().isoformat(), 'meta': self.meta}
+            f.write(json.dumps(header) + '\n')
+            for exchange in exchanges:
+                f.write(json.dumps(exchange, separators=(',', ':')) + '\n')
+        logger.info(f"📼 Saved {len(exchanges)} exchanges to {self.path}")
+
+    # ============== Record / Replay ==============
+
+    def _record(self, method: str, url: str, body: Optional[str], status: int,
+                headers: Dict[str, str], text: str, started: float, duration: float):
+        exchange = {
+            'offset': round(started - self.started, 4),
+            'duration': round(duration, 4),
+            'method': method,
+            'url': _redact_url(url),
+            'body': body,
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() in KEPT_RESPONSE_HEADERS},
+            'text': text,
+        }
+        with self._lock:
+            self.exchanges.append(exchange)
+
+    def _replay(self, method: str, url: str) -> dict:
+        with self._lock:
+            queue = self._queues.get((method, _redact_url(url)))
+            if not queue:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded response for {method} {_redact_url(url)}")
+            exchange = queue.popleft()
+            self.replayed += 1
+        if self.speed == 'recorded' and exchange['duration']:
+            time.sleep(exchange['duration'])
+        return exchange
+
+    def __call__(self, request: Request, send) -> Response:
+        """Transport middleware for the GitHub client"""
+        if self.mode == 'replay':
+            exchange = self._replay(request.verb, request.url)
+            return Response(exchange['status'], exchange['headers'], exchange['text'])
+
+        started = time.monotonic()
+        response = send(request)
+        self._record(request.verb, request.url, _body_text(request.body), response.status,
+                     response.headers, response.text, started, time.monotonic() - started)
+        return response
+
+    def stats(self) -> dict:
+        return {
+            'mode': self.mode,
+            'exchanges': len(self.exchanges),
+            'replayed': self.replayed,
+            'misses': self.misses,
+            'unused': sum(len(q) for q in self._queues.values()),
+        }
+
+    def mount(self, session):
+        """Route a `requests.Session` (e.g. the Telegram one) through the cassette"""
+        session.mount('https://api.telegram.org/', _CassetteAdapter(self))
+
+
+class _CassetteAdapter(HTTPAdapter):
+    """`requests` transport adapter that records or replays through a cassette"""
+
+    def __init__(self, cassette: Cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        if self.cassette.mode == 'record':
+            started = time.monotonic()
+            response = super().send(request, **kwargs)
+            self.cassette._record(
+                request.method, request.url, _body_text(request.body), response.status_code,
+                dict(response.headers), response.text, started, time.monotonic() - started
+            )
+            return response
+
+        exchange = self.cassette._replay(request.method, request.url)
+        response = requests.Response()
+        response.status_code = exchange['status']
+        response.headers.update(exchange['headers'])
+        response._content = exchange['text'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
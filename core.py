@@ -9,28 +9,64 @@ import json
 import time
 import logging
 import os
-import sys
 import random
-from datetime import datetime, date
+import threading
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Set, Dict, Optional
-from github import Github, GithubException
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from enum import Enum
+from itertools import islice
 from dotenv import load_dotenv
 
+from storage import FOLLOWED_USERS, IGNORED_USERS, StoredLoginSet, create_state_store
+from spill import SortedSpill, sorted_difference
+from transport import ETagCache, RequestCounter, Transport
+from ratelimit import FollowLimiter, RateLimitScheduler
+from listing import GraphQLLoginLister, LoginLister, graphql_url
+from metrics import CYCLE_DURATION, PHASE_DURATION, STATE_FLUSH_DURATION, MetricsMiddleware
+from notifier import TelegramNotifier
+from audit import ActionJournal
+from cycle_journal import CycleJournal
+from history import RelationshipHistory
+
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('github_autofollow.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Logging is configured by the entry point (see logging_setup.py)
 logger = logging.getLogger(__name__)
 
+# Attributes created on first access by GitHubFollowerBot.connect() / _load_state()
+_CLIENT_ATTRIBUTES = frozenset({
+    'github', 'github_base_url', 'user', 'transport', 'cassette', 'http_cache', 'rate_limiter', 'request_counter',
+    'lister'
+})
+_STATE_ATTRIBUTES = frozenset({
+    'followed_users', 'ignored_users', 'farming_stats', 'cleanup_stats', 'starred_repos', 'star_stats',
+    'follower_watermark', 'follow_limiter', 'history', 'store'
+})
+
+# Logins planned per run: the safety limits (20 unfollows, 5 farmed follows) plus room for failures
+CLEANUP_CANDIDATES = 100
+FARM_CANDIDATES = 10
+
+
+class FollowResult(Enum):
+    """Outcome of a follow/unfollow request"""
+    DONE = 'done'
+    NOT_FOUND = 'not_found'    # account deleted or renamed
+    BLOCKED = 'blocked'        # the user blocked us (or we blocked them)
+    LIMITED = 'limited'        # follow limit reached, nothing was sent
+    FAILED = 'failed'
+    
+    @property
+    def ok(self) -> bool:
+        return self is FollowResult.DONE
+    
+    @property
+    def unreachable(self) -> bool:
+        """The account can never be (un)followed, so don't retry it"""
+        return self in (FollowResult.NOT_FOUND, FollowResult.BLOCKED)
+
 
 class GitHubFollowerBot:
     """
@@ -52,10 +88,32 @@ class GitHubFollowerBot:
         self.cleanup_stats_file = Path('cleanup_stats.json')
         self.starred_repos_file = Path('starred_repos.json')
         self.star_stats_file = Path('star_stats.json')
+        self.follower_watermark_file = Path('follower_watermark.json')
+        self.follow_limits_file = Path('follow_limits.json')
+        self.ignored_users_file = Path('ignored_users.json')
         
         # Telegram configuration (from ENV)
         self.telegram_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID')
+        self.telegram_session = None
+        self.notifier = self._setup_notifier()
+        
+        # JSONL record of every follow/unfollow (`logging.journal`, null to disable)
+        journal_path = self.config.get('logging', {}).get('journal', 'actions.jsonl')
+        self.journal = ActionJournal(Path(journal_path)) if journal_path else None
+        
+        # Write-ahead journal of the running cycle, to resume it after a crash
+        cycle_config = self.config.get('cycle_journal', {})
+        cycle_path = cycle_config.get('path', 'cycle_journal.jsonl')
+        self.cycle_journal = CycleJournal(
+            Path(cycle_path), max_age=cycle_config.get('max_age_hours', 6) * 3600
+        ) if cycle_path else None
+        
+        # Set to interrupt waits between actions (see cancel())
+        self._cancel_event = threading.Event()
+        
+        # Receives live events (activity, phases, rate limit), e.g. the API's event stream
+        self.on_event: Optional[Callable[[str, dict], None]] = None
         
         # GitHub API initialization (from ENV)
         self.github_token = os.getenv('GITHUB_TOKEN')
@@ -63,20 +121,14 @@ class GitHubFollowerBot:
             logger.error("❌ GITHUB_TOKEN not found in environment variables")
             raise ValueError("GITHUB_TOKEN not found in environment variables")
         
-        try:
-            self.github = Github(self.github_token)
-            self.user = self.github.get_user()
-            logger.info(f"✅ Authenticated as: {self.user.login}")
-        except Exception as e:
-            logger.error(f"❌ Failed to authenticate with GitHub: {e}")
-            raise
-        
-        # Load state
-        self.followed_users = self._load_followed_users()
-        self.farming_stats = self._load_farming_stats()
-        self.cleanup_stats = self._load_cleanup_stats()
-        self.starred_repos = self._load_starred_repos()
-        self.star_stats = self._load_star_stats()
+        # The GitHub client and the state are created on first use (see connect()
+        # and _load_state()), so constructing the bot never touches the network
+        self._init_lock = threading.RLock()
+        self._connected = False
+        self._state_loaded = False
+        self._login: Optional[str] = None
+        self._login_expires = 0.0
+        self.identity_ttl = self.config.get('identity_ttl_seconds', 3600)
         
         # Session activity tracking
         self.session_activity = {
@@ -86,6 +138,137 @@ class GitHubFollowerBot:
             'starred': []
         }
     
+    # ============== Lazy Initialization ==============
+    
+    def __getattr__(self, name):
+        """Create the GitHub client or load the state on first access"""
+        if name in _CLIENT_ATTRIBUTES:
+            self.connect()
+        elif name in _STATE_ATTRIBUTES:
+            self._load_state()
+        else:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return self.__dict__[name]
+    
+    def connect(self):
+        """Create the GitHub client and its transport stack (no request is sent)"""
+        with self._init_lock:
+            if self._connected:
+                return
+            # PyGithub is imported here, it is slow to import
+            from github import Github
+            
+            # Optional client tuning, e.g. per_page or seconds_between_writes
+            client_options = dict(self.config.get('github_client', {}))
+            base_url = os.getenv('GITHUB_API_URL') or self.config.get('github_api_url')
+            if base_url:
+                client_options['base_url'] = base_url
+            self.github_base_url = client_options.get('base_url', 'https://api.github.com')
+            github = Github(self.github_token, **client_options)
+            self.transport = Transport()
+            self.cassette = self._setup_cassette()
+            self.http_cache = self._setup_http_cache()
+            rate_config = self.config.get('rate_limit', {})
+            self.rate_limiter = self.transport.add(RateLimitScheduler(
+                self._wait,
+                reserve=rate_config.get('reserve', 50),
+                max_wait=rate_config.get('max_wait_seconds', 900),
+                on_change=lambda change: self._emit('rate_limit', change)
+            ))
+            self.transport.add(MetricsMiddleware())
+            self.request_counter = self.transport.add(RequestCounter())
+            self.transport.install(github)
+            self.user = github.get_user()
+            self.lister = self._setup_lister()
+            self.github = github
+            self._connected = True
+    
+    def _setup_lister(self):
+        """Create the follower/following lister (REST pages or login-only GraphQL)"""
+        listing_config = self.config.get('listing', {})
+        per_page = listing_config.get('per_page', 100)
+        if listing_config.get('mode', 'rest') == 'graphql':
+            logger.info("🔗 Listing followers over GraphQL")
+            return GraphQLLoginLister(
+                self.user._requester,
+                url=graphql_url(self.github_base_url),
+                per_page=per_page
+            )
+        return LoginLister(
+            self.user._requester,
+            per_page=per_page,
+            concurrency=listing_config.get('concurrency', 4),
+            budget=self._api_budget
+        )
+    
+    def _api_budget(self) -> Optional[int]:
+        """Core API requests left above the rate-limit reserve, None if unknown"""
+        remaining = self.rate_limiter.remaining()
+        return None if remaining is None else max(remaining - self.rate_limiter.reserve, 0)
+    
+    def _load_state(self):
+        """Load the bot state from the state backend"""
+        with self._init_lock:
+            if self._state_loaded:
+                return
+            # State backend (JSON files or SQLite, see `state_backend` in config);
+            # opening it may import the JSON files, so it is not done in __init__
+            self.store = create_state_store(self.config, {
+                FOLLOWED_USERS: self.followers_file,
+                'farming_stats': self.farming_stats_file,
+                'cleanup_stats': self.cleanup_stats_file,
+                'starred_repos': self.starred_repos_file,
+                'star_stats': self.star_stats_file,
+                'follower_watermark': self.follower_watermark_file,
+                'follow_limits': self.follow_limits_file,
+                IGNORED_USERS: self.ignored_users_file,
+            })
+            self.followed_users = self._load_followed_users()
+            self.ignored_users = self.store.load_set(IGNORED_USERS)
+            self.farming_stats = self._load_farming_stats()
+            self.cleanup_stats = self._load_cleanup_stats()
+            self.starred_repos = self._load_starred_repos()
+            self.star_stats = self._load_star_stats()
+            self.follower_watermark = self._load_follower_watermark()
+            # Indexed log of follow/unfollow events (`history.path`, null to disable)
+            history_path = self.config.get('history', {}).get('path', 'history.db')
+            self.history = RelationshipHistory(Path(history_path)) if history_path else None
+            farming_config = self.config.get('farming', {})
+            self.follow_limiter = FollowLimiter(
+                hourly_limit=farming_config.get('hourly_follow_limit', 40),
+                daily_limit=farming_config.get('daily_follow_limit', 100),
+                state=self._load_document('follow_limits')
+            )
+            self._state_loaded = True
+    
+    @property
+    def login(self) -> str:
+        """Authenticated login, cached for `identity_ttl_seconds`"""
+        if self._login is None or time.monotonic() >= self._login_expires:
+            login = self.github.get_user().login
+            self._login, self._login_expires = login, time.monotonic() + self.identity_ttl
+        return self._login
+    
+    @property
+    def cached_login(self) -> Optional[str]:
+        """Authenticated login if already known, without any request"""
+        return self._login
+    
+    @property
+    def ready(self) -> bool:
+        """Authenticated and state loaded"""
+        return self._state_loaded and self._login is not None
+    
+    def warm_up(self):
+        """Authenticate and load the state ahead of the first cycle"""
+        try:
+            self.connect()
+            self._load_state()
+            logger.info(f"✅ Authenticated as: {self.login}")
+        except Exception as e:
+            logger.error(f"❌ Failed to authenticate with GitHub: {e}")
+            raise
+    
     # ============== Configuration Loading ==============
     
     def _load_config(self) -> dict:
@@ -100,27 +283,141 @@ class GitHubFollowerBot:
             logger.error(f"❌ Invalid JSON in config file: {e}")
             return {}
     
+    def _setup_cassette(self):
+        """Record or replay all HTTP traffic when a `cassette` is configured"""
+        cassette_config = self.config.get('cassette')
+        if not cassette_config:
+            return None
+        from cassette import Cassette
+        cassette = Cassette(
+            Path(cassette_config['path']),
+            cassette_config.get('mode', 'replay'),
+            cassette_config.get('speed', 'fast'),
+            meta={'base_url': self.github_base_url}
+        )
+        # Outermost middleware: replay answers before cache, quota and metrics
+        self.transport.add(cassette)
+        cassette.mount(self._telegram_http())
+        logger.info(f"📼 Cassette {cassette.mode}: {cassette.path}")
+        return cassette
+    
+    def _setup_http_cache(self) -> Optional[ETagCache]:
+        """Create the conditional-request cache for follower/following listings"""
+        cache_config = self.config.get('http_cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        try:
+            cache = ETagCache(Path(cache_config.get('path', 'http_cache.db')), cache_config.get('paths'))
+        except Exception as e:
+            logger.warning(f"⚠️ HTTP cache disabled: {e}")
+            return None
+        self.transport.add(cache)
+        return cache
+    
+    def http_cache_stats(self) -> dict:
+        """Cache hits and misses for the current cycle"""
+        if not self._connected or not self.http_cache:
+            return {}
+        return self.http_cache.stats()
+    
+    def rate_limit_status(self) -> dict:
+        """Remaining API quota and follow budget"""
+        return {
+            'api': self.rate_limiter.status() if self._connected else {},
+            'follows': self.follow_limiter.status() if self._state_loaded else {}
+        }
+    
+    @property
+    def api_calls(self) -> int:
+        """Total GitHub API requests sent by this bot"""
+        return self.request_counter.count if self._connected else 0
+    
     def _load_followed_users(self) -> Set[str]:
         """Load the list of users we've already followed"""
-        if self.followers_file.exists():
-            try:
-                with open(self.followers_file, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('followed_users', []))
-            except json.JSONDecodeError:
-                return set()
-        return set()
-    
-    def _save_followed_users(self):
-        """Save the list of followed users to file"""
+        if self.config.get('low_memory', {}).get('enabled', False):
+            return StoredLoginSet(self.store, FOLLOWED_USERS)
+        try:
+            return self.store.load_set(FOLLOWED_USERS)
+        except Exception as e:
+            logger.error(f"❌ Failed to load followed users: {e}")
+            return set()
+    
+    def _add_followed_user(self, username: str):
+        """Add a user to the followed set and persist that single entry"""
+        # A StoredLoginSet reads from the store, which is updated below
+        if isinstance(self.followed_users, set):
+            self.followed_users.add(username)
+        try:
+            self.store.add_to_set(FOLLOWED_USERS, username)
+        except Exception as e:
+            logger.error(f"❌ Failed to save followed user {username}: {e}")
+    
+    def _remove_followed_user(self, username: str):
+        """Remove a user from the followed set and persist that single entry"""
+        if isinstance(self.followed_users, set):
+            self.followed_users.discard(username)
+        try:
+            self.store.remove_from_set(FOLLOWED_USERS, username)
+        except Exception as e:
+            logger.error(f"❌ Failed to save unfollowed user {username}: {e}")
+    
+    def _record_history(self, event: str, username: str):
+        """Append a relationship change to the history"""
+        if not self.history:
+            return
+        try:
+            self.history.record(event, username)
+        except Exception as e:
+            logger.error(f"❌ Failed to record {event} of {username}: {e}")
+    
+    def _load_document(self, name: str) -> Optional[dict]:
+        """Load a stats document from the state backend"""
         try:
-            with open(self.followers_file, 'w') as f:
-                json.dump({
-                    'followed_users': list(self.followed_users),
-                    'last_updated': datetime.now().isoformat()
-                }, f, indent=2)
+            return self.store.load_document(name)
         except Exception as e:
-            logger.error(f"❌ Failed to save followers file: {e}")
+            logger.error(f"❌ Failed to load {name}: {e}")
+            return None
+    
+    def _save_document(self, name: str, data: dict):
+        """Save a stats document to the state backend"""
+        try:
+            self.store.save_document(name, data)
+        except Exception as e:
+            logger.error(f"❌ Failed to save {name.replace('_', ' ')}: {e}")
+    
+    def flush_state(self, force: bool = False):
+        """Write out buffered state changes (forced flushes ignore the flush interval)"""
+        if self.journal:
+            self.journal.flush()
+        if not self._state_loaded or not getattr(self.store, 'dirty', True):
+            return
+        try:
+            with STATE_FLUSH_DURATION.time():
+                self.store.flush(force=force)
+        except Exception as e:
+            logger.error(f"❌ Failed to flush state: {e}")
+    
+    def close(self):
+        """Flush pending state and release the state backend"""
+        self.flush_state(force=True)
+        if self.notifier:
+            self.notifier.close()
+        if self.journal:
+            self.journal.close()
+        if self.cycle_journal:
+            self.cycle_journal.close()
+        if self._state_loaded and self.history:
+            self.history.close()
+        if self._connected and self.http_cache:
+            self.http_cache.close()
+        if self._connected and self.cassette:
+            self.cassette.save()
+        if not self._state_loaded:
+            return
+        try:
+            self.store.close()
+        except Exception as e:
+            logger.error(f"❌ Failed to close state store: {e}")
     
     # ============== Stats Management ==============
     
@@ -134,44 +431,27 @@ class GitHubFollowerBot:
             'last_farming': None,
             'next_farming': None
         }
-        if self.farming_stats_file.exists():
-            try:
-                with open(self.farming_stats_file, 'r') as f:
-                    data = json.load(f)
-                    for key, value in defaults.items():
-                        if key not in data:
-                            data[key] = value
-                    return data
-            except Exception:
-                pass
-        return defaults
+        data = self._load_document('farming_stats')
+        if data is None:
+            return defaults
+        for key, value in defaults.items():
+            if key not in data:
+                data[key] = value
+        return data
     
     def _save_farming_stats(self):
         """Save farming statistics"""
-        try:
-            with open(self.farming_stats_file, 'w') as f:
-                json.dump(self.farming_stats, f, indent=2)
-        except Exception as e:
-            logger.error(f"❌ Failed to save farming stats: {e}")
+        self._save_document('farming_stats', self.farming_stats)
     
     def _load_cleanup_stats(self) -> dict:
         """Load cleanup statistics"""
         defaults = {'last_cleanup': None, 'next_cleanup': None, 'total_unfollowed': 0}
-        if self.cleanup_stats_file.exists():
-            try:
-                with open(self.cleanup_stats_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return defaults
+        data = self._load_document('cleanup_stats')
+        return data if data is not None else defaults
     
     def _save_cleanup_stats(self):
         """Save cleanup statistics"""
-        try:
-            with open(self.cleanup_stats_file, 'w') as f:
-                json.dump(self.cleanup_stats, f, indent=2)
-        except Exception as e:
-            logger.error(f"❌ Failed to save cleanup stats: {e}")
+        self._save_document('cleanup_stats', self.cleanup_stats)
     
     def _load_starred_repos(self) -> dict:
         """Load starred repositories data"""
@@ -182,69 +462,97 @@ class GitHubFollowerBot:
             'total_starred': 0
         }
         data = defaults.copy()
-        if self.starred_repos_file.exists():
-            try:
-                with open(self.starred_repos_file, 'r') as f:
-                    file_data = json.load(f)
-                    data.update(file_data)
-            except Exception:
-                pass
+        data.update(self._load_document('starred_repos') or {})
         result = data.copy()
         result['repos'] = set(data.get('repos', []))
         return result
     
     def _save_starred_repos(self):
         """Save starred repositories data"""
-        try:
-            save_data = self.starred_repos.copy()
-            save_data['repos'] = list(self.starred_repos['repos'])
-            with open(self.starred_repos_file, 'w') as f:
-                json.dump(save_data, f, indent=2)
-        except Exception as e:
-            logger.error(f"❌ Failed to save starred repos: {e}")
+        save_data = self.starred_repos.copy()
+        save_data['repos'] = list(self.starred_repos['repos'])
+        self._save_document('starred_repos', save_data)
     
     def _load_star_stats(self) -> dict:
         """Load star statistics"""
         defaults = {'last_run': None, 'next_run': None}
-        if self.star_stats_file.exists():
-            try:
-                with open(self.star_stats_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return defaults
+        data = self._load_document('star_stats')
+        return data if data is not None else defaults
     
     def _save_star_stats(self):
         """Save star statistics"""
-        try:
-            with open(self.star_stats_file, 'w') as f:
-                json.dump(self.star_stats, f, indent=2)
-        except Exception as e:
-            logger.error(f"❌ Failed to save star stats: {e}")
+        self._save_document('star_stats', self.star_stats)
+    
+    def _load_follower_watermark(self) -> dict:
+        """Load the last-seen head of the follower list"""
+        defaults = {'head': [], 'last_full_sync': None, 'pending': []}
+        data = self._load_document('follower_watermark')
+        if data is None:
+            return defaults
+        for key, value in defaults.items():
+            data.setdefault(key, value)
+        return data
+    
+    def _save_follower_watermark(self):
+        """Save the follower watermark"""
+        self._save_document('follower_watermark', self.follower_watermark)
     
     # ============== Notifications ==============
     
-    def _send_telegram(self, message: str):
-        """Send a message via Telegram bot"""
+    def _telegram_http(self):
+        """HTTP session used for Telegram calls"""
+        if self.telegram_session is None:
+            import requests
+            self.telegram_session = requests.Session()
+        return self.telegram_session
+    
+    def _setup_notifier(self) -> Optional[TelegramNotifier]:
+        """Create the background Telegram sender, if Telegram is configured"""
         if not self.telegram_token or not self.telegram_chat_id:
+            return None
+        telegram_config = self.config.get('telegram', {})
+        return TelegramNotifier(
+            self.telegram_token,
+            self.telegram_chat_id,
+            self._telegram_http,
+            coalesce_seconds=telegram_config.get('coalesce_seconds', 2.0),
+            max_queue=telegram_config.get('max_queue', 100),
+            max_retries=telegram_config.get('max_retries', 3)
+        )
+    
+    def _send_telegram(self, message: str):
+        """Queue a message for the Telegram bot; it is sent in the background"""
+        if self.notifier:
+            self.notifier.notify(message)
+    
+    def notification_stats(self) -> dict:
+        """Telegram delivery counters"""
+        return self.notifier.stats() if self.notifier else {}
+    
+    def activity_snapshot(self) -> Dict[str, int]:
+        """Current length of each session activity list"""
+        return {k: len(v) for k, v in self.session_activity.items()}
+    
+    def activity_since(self, snapshot: Dict[str, int]) -> Dict[str, list]:
+        """Activity recorded after `activity_snapshot()` was taken"""
+        return {k: v[snapshot.get(k, 0):] for k, v in self.session_activity.items()}
+    
+    def _emit(self, event_type: str, payload: dict):
+        """Pass a live event to the `on_event` listener, if any"""
+        if not self.on_event:
             return
-        
         try:
-            import requests
-            url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
-            data = {
-                'chat_id': self.telegram_chat_id,
-                'text': message,
-                'parse_mode': 'HTML'
-            }
-            requests.post(url, data=data, timeout=10)
+            self.on_event(event_type, payload)
         except Exception as e:
-            logger.warning(f"⚠️ Telegram notification error: {e}")
+            logger.warning(f"⚠️ Event listener failed: {e}")
     
     def _record_activity(self, activity_type: str, item: str):
         """Record an activity for session report"""
         if activity_type in self.session_activity:
             self.session_activity[activity_type].append(item)
+            if self.cycle_journal:
+                self.cycle_journal.activity(activity_type, item)
+            self._emit('activity', {'type': activity_type, 'item': item})
     
     def send_session_report(self):
         """Send a consolidated report of all activity in this session"""
@@ -275,52 +583,215 @@ class GitHubFollowerBot:
         
         # Clear activity
         self.session_activity = {k: [] for k in self.session_activity}
+        if self.cycle_journal:
+            self.cycle_journal.reported()
+    
+    # ============== Cancellation ==============
+    
+    def cancel(self):
+        """Interrupt the running task at the next wait between actions"""
+        self._cancel_event.set()
+    
+    def reset_cancel(self):
+        """Allow tasks to run again after a cancel()"""
+        self._cancel_event.clear()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    def _wait(self, seconds: float) -> bool:
+        """Pause between actions; returns False if the wait was cancelled"""
+        return not self._cancel_event.wait(seconds)
     
     # ============== Core Actions ==============
     
-    def follow_user(self, username: str) -> bool:
-        """Follow a GitHub user"""
+    def _set_following(self, username: str, follow: bool) -> FollowResult:
+        """PUT/DELETE /user/following/{username} directly, without a profile lookup"""
+        from github import GithubException, UnknownObjectException
+        
+        verb = 'PUT' if follow else 'DELETE'
+        started = time.perf_counter()
         try:
-            user = self.github.get_user(username)
-            self.user.add_to_following(user)
-            logger.info(f"✅ Followed: {username}")
-            return True
+            self.user._requester.requestJsonAndCheck(verb, f"/user/following/{username}")
+            result = FollowResult.DONE
+        except UnknownObjectException:
+            result = FollowResult.NOT_FOUND
         except GithubException as e:
-            logger.error(f"❌ Error following {username}: {e}")
-            return False
+            message = str(e.data.get('message', '')) if isinstance(e.data, dict) else ''
+            if e.status in (403, 422) and 'block' in message.lower():
+                result = FollowResult.BLOCKED
+            else:
+                logger.error(f"❌ Error {'following' if follow else 'unfollowing'} {username}: {e}")
+                result = FollowResult.FAILED
+        if self.journal:
+            self.journal.record(
+                'follow' if follow else 'unfollow', username, result.value, time.perf_counter() - started
+            )
+        return result
     
-    def unfollow_user(self, username: str) -> bool:
-        """Unfollow a GitHub user"""
+    def _ignore_user(self, username: str, result: FollowResult):
+        """Remember accounts that can't be followed so they are not retried"""
+        logger.warning(f"🚫 Skipping {username}: {result.value.replace('_', ' ')}")
+        self.ignored_users.add(username)
         try:
-            user = self.github.get_user(username)
-            self.user.remove_from_following(user)
+            self.store.add_to_set(IGNORED_USERS, username)
+        except Exception as e:
+            logger.error(f"❌ Failed to save ignored user {username}: {e}")
+    
+    def follow_user(self, username: str) -> FollowResult:
+        """Follow a GitHub user (within the hourly/daily follow limits)"""
+        if not self.follow_limiter.available():
+            logger.warning(f"⏸️ Follow limit reached, not following {username}")
+            return FollowResult.LIMITED
+        result = self._set_following(username, True)
+        if result.ok:
+            self.follow_limiter.record()
+            self._save_document('follow_limits', self.follow_limiter.to_dict())
+            logger.info(f"✅ Followed: {username}")
+        return result
+    
+    def unfollow_user(self, username: str) -> FollowResult:
+        """Unfollow a GitHub user"""
+        result = self._set_following(username, False)
+        if result.ok:
             logger.info(f"🗑️ Unfollowed: {username}")
+        return result
+    
+    def _full_follower_sync_due(self) -> bool:
+        """Whether the next follower check must page through the whole list"""
+        sync_config = self.config.get('follower_sync', {})
+        if not sync_config.get('incremental', True):
             return True
-        except GithubException as e:
-            logger.error(f"❌ Error unfollowing {username}: {e}")
-            return False
+        last = self.follower_watermark.get('last_full_sync')
+        if not self.follower_watermark.get('head') or not last:
+            return True
+        interval = timedelta(hours=sync_config.get('full_sync_interval_hours', 6))
+        return datetime.now() - datetime.fromisoformat(last) >= interval
+    
+    def _fetch_new_followers(self) -> List[str]:
+        """
+        Return followers that appeared since the last check and are not
+        followed (or ignored) yet, newest first. The follower list is newest
+        first, so paging stops at the first login from the stored head. A
+        periodic full pass looks at every follower, so the ones the
+        incremental checks missed are followed back too.
+        """
+        head_size = self.config.get('follower_sync', {}).get('watermark_size', 10)
+        known_head = set(self.follower_watermark['head'])
+        full_sync = self._full_follower_sync_due()
+        
+        fresh = []  # top of the list, the next watermark
+        new_followers = []
+        reached_watermark = False
+        # Incremental checks usually stop on the first page, so only full syncs prefetch
+        for login in self.lister.logins('/user/followers', concurrent=full_sync):
+            if not full_sync and login in known_head:
+                reached_watermark = True
+                break
+            if len(fresh) < head_size:
+                fresh.append(login)
+            # Only candidates are kept, so a full sync never holds the whole list
+            if login not in self.followed_users and login not in self.ignored_users:
+                new_followers.append(login)
+        
+        if reached_watermark:
+            fresh_set = set(fresh)
+            head = fresh + [h for h in self.follower_watermark['head'] if h not in fresh_set]
+        else:
+            # Walked the whole list
+            head = fresh
+            self.follower_watermark['last_full_sync'] = datetime.now().isoformat()
+        
+        self.follower_watermark['head'] = head[:head_size]
+        self._save_follower_watermark()
+        return new_followers
+    
+    def _planned(self, phase: str, plan: Callable[[], List[str]],
+                 recheck: Optional[Callable[[List[str]], List[str]]] = None) -> List[str]:
+        """
+        Logins a phase acts on. An interrupted cycle continues with the steps
+        left in its journal, without listing again, minus the ones `recheck`
+        drops from local state; otherwise `plan()` is called and its result
+        journaled before any action is taken.
+        """
+        journal = self.cycle_journal
+        remaining = journal.remaining(phase) if journal else None
+        if remaining is not None:
+            logins = recheck(remaining) if recheck else remaining
+            skipped = len(remaining) - len(logins)
+            logger.info(f"♻️ Resuming {phase}: {len(logins)} step(s) left"
+                        + (f", {skipped} already done" if skipped else ""))
+            return logins
+        if journal and not journal.active:
+            # A manual job: its steps are not journaled, so the interrupted
+            # cycle must not repeat the phase from its old plan
+            journal.discard(phase)
+        logins = plan()
+        if journal:
+            journal.plan(phase, logins)
+        return logins
+    
+    def _not_followed(self, logins: List[str]) -> List[str]:
+        """`logins` not followed or ignored (yet)"""
+        return [login for login in logins if login not in self.followed_users and login not in self.ignored_users]
+    
+    def _journal_step(self, phase: str, login: str, result: FollowResult):
+        if self.cycle_journal:
+            self.cycle_journal.step(phase, login, result.value)
+    
+    def _follow_back_candidates(self) -> List[str]:
+        """New followers not followed (or ignored) yet, newest first"""
+        # Keep the API order (newest first) so runs are reproducible. Followers
+        # deferred by the follow limit, a stop, a failed request or an error are
+        # carried over in `pending`, since the watermark has already moved past them.
+        candidates = self._fetch_new_followers() + self.follower_watermark['pending']
+        return self._not_followed(list(dict.fromkeys(candidates)))
     
     def check_and_follow_back(self):
         """Check for new followers and follow them back"""
         logger.info("🔍 Checking for new followers...")
         try:
-            current_followers = {u.login for u in self.user.get_followers()}
-            new_followers = current_followers - self.followed_users
+            new_followers = self._planned('follow_back', self._follow_back_candidates, self._not_followed)
             
             if new_followers:
                 logger.info(f"🎉 Found {len(new_followers)} new follower(s)!")
-                for follower in new_followers:
-                    self._record_activity('followed_back', follower)
-                    if self.follow_user(follower):
-                        self.followed_users.add(follower)
-                        self._save_followed_users()
-                    time.sleep(2)
+                self._follow_back(new_followers)
             else:
                 logger.info("✨ No new followers to follow back")
                 
         except Exception as e:
             logger.error(f"❌ Error in follow back check: {e}")
     
+    def _follow_back(self, new_followers: List[str]):
+        """
+        Follow back `new_followers`; the ones that failed or were not reached
+        (follow limit, stop, error) are kept pending for the next check
+        """
+        failed = []
+        done = 0
+        try:
+            for follower in new_followers:
+                if not self.follow_limiter.available():
+                    logger.warning("⏸️ Follow limit reached, remaining follow-backs deferred")
+                    break
+                self._record_activity('followed_back', follower)
+                result = self.follow_user(follower)
+                done += 1
+                if result.ok:
+                    self._add_followed_user(follower)
+                    self._record_history('follow_back', follower)
+                elif result.unreachable:
+                    self._ignore_user(follower, result)
+                else:
+                    failed.append(follower)
+                self._journal_step('follow_back', follower, result)
+                if not self._wait(2):
+                    break
+        finally:
+            self.follower_watermark['pending'] = failed + new_followers[done:]
+            self._save_follower_watermark()
+    
     def cleanup_non_followers(self):
         """Unfollow users who don't follow you back"""
         if not self.config.get('cleanup_non_followers', False):
@@ -328,32 +799,89 @@ class GitHubFollowerBot:
         
         logger.info("🧹 Starting cleanup...")
         try:
-            followers = {u.login for u in self.user.get_followers()}
-            following = {u.login for u in self.user.get_following()}
-            
-            non_followers = following - followers
-            if non_followers:
-                logger.info(f"🔍 Found {len(non_followers)} non-followers")
-                count = 0
-                for user in non_followers:
-                    if count >= 20:  # Safety limit per run
-                        break
-                    if self.unfollow_user(user):
-                        self._record_activity('unfollowed', user)
-                        if user in self.followed_users:
-                            self.followed_users.remove(user)
-                            self._save_followed_users()
-                        count += 1
-                        time.sleep(2)
-                
-                if count > 0:
-                    self._send_telegram(f"🗑️ <b>Cleanup:</b> Unfollowed {count} users")
-            else:
-                logger.info("✨ Everyone follows you back!")
-                
+            non_followers = self._planned('cleanup', self._cleanup_candidates)
+            self._unfollow_non_followers(non_followers)
         except Exception as e:
             logger.error(f"❌ Error in cleanup: {e}")
     
+    def _cleanup_candidates(self) -> List[str]:
+        """Non-followers to try this run, in sorted order"""
+        low_memory = self.config.get('low_memory', {})
+        if low_memory.get('enabled', False):
+            total, candidates = self._cleanup_spilled(
+                low_memory.get('max_logins_in_memory', 50000), low_memory.get('spill_dir')
+            )
+        else:
+            followers = set(self.lister.logins('/user/followers'))
+            following = set(self.lister.logins('/user/following'))
+            non_followers = following - followers
+            total = len(non_followers)
+            candidates = sorted(non_followers)[:CLEANUP_CANDIDATES]
+        
+        if total:
+            logger.info(f"🔍 Found {total} non-followers")
+        else:
+            logger.info("✨ Everyone follows you back!")
+        return candidates
+    
+    def _cleanup_spilled(self, max_items: int, directory: Optional[str] = None) -> Tuple[int, List[str]]:
+        """
+        Cleanup listing with bounded memory: both listings are spilled as sorted
+        runs and `following - followers` is a merge join over them, in the same
+        (sorted) order as the in-memory path. Each spill is flushed to disk
+        before the next one fills, so at most `max_items` logins are buffered.
+        """
+        with SortedSpill(max_items, directory) as followers, \
+                SortedSpill(max_items, directory) as following, \
+                SortedSpill(max_items, directory) as non_followers:
+            followers.extend(self.lister.logins('/user/followers'))
+            followers.flush()
+            following.extend(self.lister.logins('/user/following'))
+            following.flush()
+            non_followers.extend(sorted_difference(following, followers))
+            logger.debug(
+                f"💽 Cleanup spilled {followers.runs + following.runs + non_followers.runs} sorted run(s)"
+            )
+            return non_followers.added, list(islice(non_followers, CLEANUP_CANDIDATES))
+    
+    def _unfollow_non_followers(self, non_followers: List[str]):
+        """Unfollow up to 20 non-followers, in the given order"""
+        # Unfollows done before the cycle was interrupted count towards the limit
+        count = self.cycle_journal.completed('cleanup', FollowResult.DONE.value) if self.cycle_journal else 0
+        for user in non_followers:
+            if count >= 20:  # Safety limit per run
+                break
+            result = self.unfollow_user(user)
+            if result is FollowResult.NOT_FOUND and user in self.followed_users:
+                # Account is gone, nothing left to unfollow
+                self._remove_followed_user(user)
+            if result.ok:
+                self._record_activity('unfollowed', user)
+                self._record_history('unfollow', user)
+                if user in self.followed_users:
+                    self._remove_followed_user(user)
+                count += 1
+            self._journal_step('cleanup', user, result)
+            if result.ok and not self._wait(2):
+                break
+        
+        if count > 0:
+            self._send_telegram(f"🗑️ <b>Cleanup:</b> Unfollowed {count} users")
+    
+    def _farm_candidates(self) -> List[str]:
+        """Stargazers of a random target repository that could be followed"""
+        # Pick random repo to avoid repetitive spam
+        repo_name = random.choice(self.config['farming']['target_repos'])
+        logger.info(f"🌾 Farming from {repo_name}")
+        candidates = []
+        for user in self.github.get_repo(repo_name).get_stargazers():
+            if len(candidates) >= FARM_CANDIDATES:
+                break
+            if (user.login not in self.followed_users and user.login not in self.ignored_users
+                    and user.login != self.login):
+                candidates.append(user.login)
+        return candidates
+    
     def farm_followers(self):
         """Farm followers from target repositories"""
         farming_config = self.config.get('farming', {})
@@ -365,30 +893,84 @@ class GitHubFollowerBot:
         if not target_repos:
             return
         
-        # Pick random repo to avoid repetitive spam
-        repo_name = random.choice(target_repos)
         try:
-            repo = self.github.get_repo(repo_name)
-            stargazers = repo.get_stargazers()
+            candidates = self._planned('farm', self._farm_candidates, self._not_followed)
             
-            count = 0
-            for user in stargazers:
+            count = self.cycle_journal.completed('farm', FollowResult.DONE.value) if self.cycle_journal else 0
+            for login in candidates:
                 if count >= 5:  # Small batch per cycle
                     break
-                if user.login not in self.followed_users and user.login != self.user.login:
-                    logger.info(f"🌾 Farming: {user.login} from {repo_name}")
-                    if self.follow_user(user.login):
-                        self.followed_users.add(user.login)
-                        self._save_followed_users()
-                        self._record_activity('farmed', user.login)
-                        count += 1
-                        time.sleep(3)
+                if not self.follow_limiter.available():
+                    logger.warning("⏸️ Follow limit reached, farming paused")
+                    break
+                logger.info(f"🌾 Farming: {login}")
+                result = self.follow_user(login)
+                if result.unreachable:
+                    self._ignore_user(login, result)
+                if result.ok:
+                    self._add_followed_user(login)
+                    self._record_history('follow', login)
+                    self._record_activity('farmed', login)
+                    count += 1
+                self._journal_step('farm', login, result)
+                if result.ok and not self._wait(3):
+                    break
         except Exception as e:
             logger.error(f"❌ Farming error: {e}")
     
     def run_cycle(self):
         """Run one complete cycle of all tasks"""
-        self.check_and_follow_back()
-        self.farm_followers()
-        self.cleanup_non_followers()
-        self.send_session_report()
+        with CYCLE_DURATION.time():
+            self._run_phases()
+    
+    def _run_phases(self):
+        """Run each cycle phase in priority order, timing every phase"""
+        if self.http_cache:
+            self.http_cache.reset_counters()
+        budgets = self.config.get('rate_limit', {}).get('phase_min_budget', {})
+        phases = (
+            ('follow_back', self.check_and_follow_back),
+            ('farm', self.farm_followers),
+            ('cleanup', self.cleanup_non_followers),
+        )
+        journal = self.cycle_journal
+        if journal and journal.resume():
+            logger.info("♻️ Resuming the interrupted cycle")
+            for activity_type, item in journal.activities:
+                self.session_activity[activity_type].append(item)
+        elif journal:
+            journal.begin()
+        for name, phase in phases:
+            if self.cancelled:
+                logger.info("🛑 Cycle cancelled")
+                break
+            if journal and journal.phase_done(name):
+                continue
+            # Lower-priority phases give way when the API budget runs low
+            if not self.rate_limiter.can_afford(budgets.get(name, 0)):
+                logger.warning(f"⏭️ Skipping {name}: only {self.rate_limiter.remaining()} API calls left")
+                self._emit('phase', {'phase': name, 'state': 'skipped'})
+                continue
+            self._emit('phase', {'phase': name, 'state': 'started'})
+            started, state = time.perf_counter(), 'failed'
+            try:
+                with PHASE_DURATION.time(phase=name):
+                    phase()
+                state = 'cancelled' if self.cancelled else 'finished'
+            finally:
+                self._emit('phase', {
+                    'phase': name,
+                    'state': state,
+                    'duration_seconds': round(time.perf_counter() - started, 3)
+                })
+            if journal and not self.cancelled:
+                journal.finish_phase(name)
+        with PHASE_DURATION.time(phase='report'):
+            self.send_session_report()
+        self.flush_state(force=True)
+        if journal:
+            # A cancelled cycle is resumed by the next one
+            if self.cancelled:
+                journal.close()
+            else:
+                journal.end()
@@ -0,0 +1,174 @@
+"""
+GitHub Follower Bot - Cycle Journal
+Write-ahead journal of a running cycle, so an interrupted cycle resumes where it stopped
+
+Created by: dewhush
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CycleJournal:
+    """
+    Append-only JSONL journal of the current cycle, fsynced record by record:
+    - begin: a new cycle started
+    - plan: the logins a phase is going to act on, written before acting
+    - step: one login of the plan was handled (with its outcome)
+    - activity: an entry of the session report (`reported` once it was sent)
+    - phase: a phase ran to completion
+    - discard: a manual job ran the phase since the cycle was interrupted,
+      so its plan is dropped and planned again on resume
+    The file is removed when the cycle ends. If it is still there on the next
+    cycle, the process died (or was stopped) mid-cycle: completed phases are
+    skipped and planned phases only handle the logins without a step.
+    """
+
+    def __init__(self, path: Path, max_age: float = 6 * 3600):
+        self.path = Path(path)
+        # Older plans may be out of date (e.g. a non-follower followed back since)
+        self.max_age = max_age
+        self.active = False
+        self._file = None
+        self._plans: Dict[str, List[str]] = {}
+        self._steps: Dict[str, Dict[str, str]] = {}
+        self._phases: Set[str] = set()
+        self.activities: List[Tuple[str, str]] = []
+
+    def _reset(self):
+        self._plans, self._steps, self._phases, self.activities = {}, {}, set(), []
+
+    def _write(self, record: dict):
+        if not self.active:
+            return
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _read(self) -> List[dict]:
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn last line from a crash mid-write
+                    break
+        return records
+
+    # ============== Cycle Lifecycle ==============
+
+    def resume(self) -> bool:
+        """Load an interrupted cycle and continue it; returns False if there is none"""
+        self.close()
+        if not self.path.exists():
+            return False
+        try:
+            records = self._read()
+        except OSError as e:
+            logger.warning(f"⚠️ Could not read cycle journal: {e}")
+            return False
+        if not records or records[0].get('type') != 'begin':
+            return False
+        if time.time() - records[0].get('ts', 0) > self.max_age:
+            logger.warning("⚠️ Interrupted cycle is too old to resume, starting over")
+            return False
+
+        self._reset()
+        for record in records:
+            kind = record.get('type')
+            if kind == 'plan':
+                self._plans[record['phase']] = record['logins']
+                self._steps.setdefault(record['phase'], {})
+            elif kind == 'step':
+                self._steps.setdefault(record['phase'], {})[record['login']] = record['outcome']
+            elif kind == 'activity':
+                self.activities.append((record['activity'], record['item']))
+            elif kind == 'reported':
+                self.activities = []
+            elif kind == 'phase':
+                self._phases.add(record['phase'])
+            elif kind == 'discard':
+                self._plans.pop(record['phase'], None)
+                self._steps.pop(record['phase'], None)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.active = True
+        return True
+
+    def begin(self):
+        """Start journaling a new cycle"""
+        self.close()
+        self._reset()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self.active = True
+        self._write({'type': 'begin', 'ts': time.time()})
+
+    def end(self):
+        """The cycle completed: forget it"""
+        self.close()
+        self._reset()
+        self.path.unlink(missing_ok=True)
+
+    def close(self):
+        """Stop journaling, keeping the file so the cycle can be resumed"""
+        self.active = False
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    # ============== Records ==============
+
+    def plan(self, phase: str, logins: List[str]):
+        self._plans[phase] = list(logins)
+        self._steps[phase] = {}
+        self._write({'type': 'plan', 'phase': phase, 'logins': self._plans[phase]})
+
+    def step(self, phase: str, login: str, outcome: str):
+        self._steps.setdefault(phase, {})[login] = outcome
+        self._write({'type': 'step', 'phase': phase, 'login': login, 'outcome': outcome})
+
+    def discard(self, phase: str):
+        """Outside a cycle: drop the plan of `phase` from an interrupted cycle, if any"""
+        if self.active or not self.path.exists():
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'type': 'discard', 'phase': phase}) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.warning(f"⚠️ Could not update cycle journal: {e}")
+
+    def activity(self, activity_type: str, item: str):
+        self._write({'type': 'activity', 'activity': activity_type, 'item': item})
+
+    def reported(self):
+        self.activities = []
+        self._write({'type': 'reported'})
+
+    def finish_phase(self, phase: str):
+        self._phases.add(phase)
+        self._write({'type': 'phase', 'phase': phase})
+
+    # ============== Queries ==============
+
+    def phase_done(self, phase: str) -> bool:
+        return self.active and phase in self._phases
+
+    def remaining(self, phase: str) -> Optional[List[str]]:
+        """Planned logins of a resumed phase not handled yet, None if the phase has no plan"""
+        if not self.active or phase not in self._plans:
+            return None
+        steps = self._steps.get(phase, {})
+        return [login for login in self._plans[phase] if login not in steps]
+
+    def completed(self, phase: str, outcome: str) -> int:
+        """Steps of a phase that ended with `outcome`"""
+        return sum(1 for o in self._steps.get(phase, {}).values() if o == outcome)
@@ -0,0 +1,188 @@
+"""
+GitHub Follower Bot - Live Events
+Server-Sent Events fan-out of bot activity, phases and rate-limit changes
+
+Created by: dewhush
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional, Set, Tuple
+
+from metrics import SSE_CLIENTS, SSE_DROPPED
+
+logger = logging.getLogger(__name__)
+
+
+class EventClient:
+    """Buffer of encoded frames waiting to be sent to one SSE client"""
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self.dropped = False
+        self._frames: Deque[str] = deque()
+        self._ready = asyncio.Event()
+
+    def push(self, frame: str):
+        if self.dropped:
+            return
+        if len(self._frames) >= self.max_queue:
+            # Too far behind: disconnect rather than buffer without limit
+            self.dropped = True
+            self._frames.clear()
+        else:
+            self._frames.append(frame)
+        self._ready.set()
+
+    async def next_frames(self, timeout: float) -> List[str]:
+        """Frames buffered so far, waiting up to `timeout` seconds for one; [] on timeout"""
+        if not self._frames and not self.dropped:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._ready.clear()
+        frames = list(self._frames)
+        self._frames.clear()
+        return frames
+
+
+class EventLog:
+    """
+    Events of the leader worker appended to a shared JSONL file, which the
+    other workers tail to serve the same stream. The file is rotated once it
+    exceeds `max_bytes`; a reader finishes the rotated file through its open
+    handle before switching to the new one.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._writer = None
+        self._reader = None
+        self._partial = ''
+
+    def append(self, event_id: int, event_type: str, data: str):
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = open(self.path, 'a', encoding='utf-8')
+        self._writer.write(json.dumps({'id': event_id, 'type': event_type, 'data': data}) + '\n')
+        self._writer.flush()
+        if self._writer.tell() > self.max_bytes:
+            self._writer.close()
+            self._writer = None
+            os.replace(self.path, self.path.with_name(self.path.name + '.1'))
+
+    def read_new(self) -> List[Tuple[int, str, str]]:
+        """Events appended since the last call (the first call starts at the end of the file)"""
+        if self._reader is None:
+            try:
+                self._reader = open(self.path, 'r', encoding='utf-8')
+            except FileNotFoundError:
+                return []
+            self._reader.seek(0, os.SEEK_END)
+        events = []
+        while True:
+            chunk = self._reader.read()
+            if chunk:
+                lines = (self._partial + chunk).split('\n')
+                self._partial = lines.pop()
+                for line in lines:
+                    try:
+                        record = json.loads(line)
+                        events.append((record['id'], record['type'], record['data']))
+                    except (ValueError, KeyError):
+                        logger.warning("⚠️ Skipping a malformed event log line")
+            # At the end of a rotated file: continue with the new one
+            try:
+                rotated = os.stat(self.path).st_ino != os.fstat(self._reader.fileno()).st_ino
+            except FileNotFoundError:
+                rotated = False
+            if not rotated:
+                return events
+            self._reader.close()
+            self._reader = open(self.path, 'r', encoding='utf-8')
+            self._partial = ''
+
+    def close(self):
+        for f in (self._writer, self._reader):
+            if f:
+                f.close()
+        self._writer = self._reader = None
+
+
+class EventBus:
+    """
+    Fan-out of bot events to Server-Sent Events clients:
+    - publish() may be called from any thread; the payload is encoded once,
+      whatever the number of clients
+    - Each client has a buffer of `max_queue` events; a client that falls
+      further behind is disconnected (it can reconnect with Last-Event-ID)
+    - The last `replay` events are kept for reconnecting clients
+    Event ids grow across restarts (they start from the clock in milliseconds).
+    """
+
+    def __init__(self, max_queue: int = 256, replay: int = 256, log: Optional[EventLog] = None):
+        self.max_queue = max_queue
+        self.log = log
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._clients: Set[EventClient] = set()
+        self._recent: Deque[Tuple[int, str]] = deque(maxlen=replay)
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Event loop serving the clients; events published before are dropped"""
+        self._loop = loop
+
+    def publish(self, event_type: str, payload: dict):
+        data = json.dumps(payload, separators=(',', ':'))
+        with self._lock:
+            self._last_id = max(self._last_id + 1, int(time.time() * 1000))
+            event_id = self._last_id
+            if self.log:
+                try:
+                    self.log.append(event_id, event_type, data)
+                except OSError as e:
+                    logger.warning(f"⚠️ Failed to write event log: {e}")
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.dispatch, event_id, event_type, data)
+
+    def dispatch(self, event_id: int, event_type: str, data: str):
+        """Send an event to every client (event loop thread only)"""
+        with self._lock:
+            # Relayed events keep the leader's ids, continued if this worker takes over
+            self._last_id = max(self._last_id, event_id)
+        frame = f'id: {event_id}\nevent: {event_type}\ndata: {data}\n\n'
+        self._recent.append((event_id, frame))
+        for client in list(self._clients):
+            client.push(frame)
+            if client.dropped:
+                self.unsubscribe(client)
+                SSE_DROPPED.inc()
+                logger.warning("⚠️ Disconnected a slow event stream client")
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> EventClient:
+        """New client (event loop thread only), first replaying the events after `last_event_id`"""
+        client = EventClient(self.max_queue)
+        if last_event_id is not None:
+            missed = [frame for event_id, frame in self._recent if event_id > last_event_id]
+            for frame in missed[-self.max_queue:]:
+                client.push(frame)
+        self._clients.add(client)
+        SSE_CLIENTS.set(len(self._clients))
+        return client
+
+    def unsubscribe(self, client: EventClient):
+        self._clients.discard(client)
+        SSE_CLIENTS.set(len(self._clients))
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
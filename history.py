@@ -0,0 +1,109 @@
+"""
+GitHub Follower Bot - Relationship History
+Append-only, indexed log of follow, follow-back and unfollow events
+
+Created by: dewhush
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EVENTS = ('follow', 'follow_back', 'unfollow')
+MAX_PAGE_SIZE = 1000
+
+
+class RelationshipHistory:
+    """
+    SQLite table of events, indexed by (ts, id) and by (login, id), so a time
+    range or a single login is found with an index seek instead of a scan.
+    Events are only ever appended. Pages are returned oldest first; the cursor
+    is the id of the last event of the page.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts REAL NOT NULL,
+            login TEXT NOT NULL,
+            event TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS events_by_time ON events (ts, id);
+        CREATE INDEX IF NOT EXISTS events_by_login ON events (login, id);
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+
+    def record(self, event: str, login: str, ts: Optional[float] = None):
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event: {event}")
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO events (ts, login, event) VALUES (?, ?, ?)',
+                (ts if ts is not None else time.time(), login, event)
+            )
+
+    @staticmethod
+    def _cursor(cursor: Optional[str]) -> int:
+        try:
+            return int(cursor or 0)
+        except ValueError:
+            raise ValueError("Invalid cursor") from None
+
+    @staticmethod
+    def _page(rows: list, limit: int) -> Tuple[List[dict], Optional[str]]:
+        events = [
+            {'id': row[0], 'ts': datetime.fromtimestamp(row[1]).isoformat(), 'login': row[2], 'event': row[3]}
+            for row in rows[:limit]
+        ]
+        # One extra row was fetched to know whether there is a next page
+        next_cursor = str(events[-1]['id']) if len(rows) > limit else None
+        return events, next_cursor
+
+    def since(self, since: Optional[float] = None, cursor: Optional[str] = None, limit: int = 100,
+              event: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """Events at or after `since` (epoch seconds), oldest first; returns (events, next cursor)"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        with self._lock:
+            if cursor:
+                row = self._conn.execute('SELECT ts, id FROM events WHERE id = ?', (self._cursor(cursor),)).fetchone()
+                if row is None:
+                    raise ValueError("Unknown cursor")
+                where, params = '(ts, id) > (?, ?)', list(row)
+            else:
+                where, params = 'ts >= ?', [since or 0]
+            if event:
+                where += ' AND event = ?'
+                params.append(event)
+            rows = self._conn.execute(
+                f'SELECT id, ts, login, event FROM events WHERE {where} ORDER BY ts, id LIMIT ?',
+                (*params, limit + 1)
+            ).fetchall()
+        return self._page(rows, limit)
+
+    def for_login(self, login: str, cursor: Optional[str] = None,
+                  limit: int = 100) -> Tuple[List[dict], Optional[str]]:
+        """Events of one login, oldest first; returns (events, next cursor)"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, ts, login, event FROM events WHERE login = ? AND id > ? ORDER BY id LIMIT ?',
+                (login, self._cursor(cursor), limit + 1)
+            ).fetchall()
+        return self._page(rows, limit)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
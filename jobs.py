@@ -0,0 +1,137 @@
+"""
+GitHub Follower Bot - Job Queue
+Background jobs for the manual action endpoints
+
+Created by: dewhush
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A single queued bot action and its outcome"""
+
+    def __init__(self, action: str, job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex
+        self.action = action
+        self.status = 'queued'
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.api_calls = 0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self._started = 0.0
+        self._duration: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ('queued', 'running')
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self._duration is not None:
+            return self._duration
+        if self.started_at:
+            return round(time.monotonic() - self._started, 3)
+        return None
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'action': self.action,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration,
+            'api_calls': self.api_calls,
+            'result': self.result,
+            'error': self.error,
+        }
+
+
+class JobManager:
+    """
+    Runs jobs in the background and keeps a bounded history of them.
+    Submitting an action that is already queued or running returns the
+    existing job instead of starting the same work twice (single-flight).
+    """
+
+    def __init__(self, worker, api_calls: Callable[[], int], max_history: int = 200):
+        self.worker = worker
+        self._api_calls = api_calls
+        self.max_history = max_history
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._active: Dict[str, Job] = {}
+        # Requested job ids that were merged into another in-flight job
+        self._aliases: 'OrderedDict[str, str]' = OrderedDict()
+        self._tasks = set()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(self._aliases.get(job_id, job_id))
+
+    def submit(self, action: str, fn: Callable[[], Any], job_id: Optional[str] = None) -> Tuple[Job, bool]:
+        """
+        Queue `fn` on the bot worker; returns the job and whether it was newly created.
+        `job_id` is used for jobs submitted on behalf of another API worker.
+        """
+        existing = self._active.get(action)
+        if existing and existing.active:
+            if job_id:
+                self._aliases[job_id] = existing.id
+                while len(self._aliases) > self.max_history:
+                    self._aliases.popitem(last=False)
+            return existing, False
+
+        job = Job(action, job_id)
+        self.jobs[job.id] = job
+        self._active[action] = job
+        while len(self.jobs) > self.max_history:
+            self.jobs.popitem(last=False)
+
+        task = asyncio.create_task(self._execute(job, fn))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job, True
+
+    def snapshot(self) -> dict:
+        """All known jobs as dicts, for the shared multi-worker snapshot"""
+        return {
+            'jobs': {job_id: job.to_dict() for job_id, job in self.jobs.items()},
+            'aliases': dict(self._aliases),
+        }
+
+    async def _execute(self, job: Job, fn: Callable[[], Any]):
+        def run():
+            # Runs on the worker thread, so queue time is not counted as run time
+            job.status = 'running'
+            job.started_at = datetime.now()
+            job._started = time.monotonic()
+            calls_before = self._api_calls()
+            try:
+                return fn()
+            finally:
+                job.api_calls = self._api_calls() - calls_before
+
+        try:
+            job.result = await self.worker.run(run)
+            job.status = 'succeeded'
+        except Exception as e:
+            logger.error(f"❌ Job {job.action} ({job.id}) failed: {e}")
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished_at = datetime.now()
+            if job.started_at:
+                job._duration = round(time.monotonic() - job._started, 3)
+            if self._active.get(job.action) is job:
+                del self._active[job.action]
@@ -0,0 +1,235 @@
+"""
+GitHub Follower Bot - Multi-Worker Coordination
+Leader election and shared state for running the API with several workers
+
+Created by: dewhush
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+from storage import atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock:
+    """
+    Exclusive, non-blocking lock on a file. The worker holding it is the
+    leader; the OS releases it when that process exits, so another worker
+    can take over.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """Try to become the leader; returns whether the lock is held"""
+        if self._file:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(self.path, 'a+')
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._file = f
+        return True
+
+    def release(self):
+        if not self._file:
+            return
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class SharedSnapshot:
+    """
+    JSON snapshot written atomically by the leader and read by the other workers.
+    An unchanged snapshot is only rewritten every `heartbeat` seconds, so that
+    readers still see a live leader. It is rebuilt continuously and is useless
+    after a crash, so it is renamed into place without an fsync.
+    """
+
+    def __init__(self, path: Path, heartbeat: float = 3.0):
+        self.path = Path(path)
+        self.heartbeat = heartbeat
+        self._cached: Optional[dict] = None
+        self._cached_version: Optional[tuple] = None
+        self._written: Optional[dict] = None
+        self._written_at = 0.0
+
+    def write(self, data: dict) -> bool:
+        """Publish `data` if it changed or the heartbeat is due; returns True if written"""
+        now = time.time()
+        if data == self._written and now - self._written_at < self.heartbeat:
+            return False
+        atomic_write_json(self.path, dict(data, pid=os.getpid(), updated_at=now), indent=None, fsync=False)
+        self._written, self._written_at = data, now
+        return True
+
+    def read(self) -> Optional[dict]:
+        """Latest snapshot, re-parsed only when the file changed"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        # Every write replaces the file, so the inode changes even within one mtime tick
+        version = (stat.st_ino, stat.st_mtime_ns)
+        if version != self._cached_version:
+            try:
+                with open(self.path, 'r') as f:
+                    self._cached = json.load(f)
+                self._cached_version = version
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠️ Failed to read shared snapshot: {e}")
+        return self._cached
+
+    def age(self) -> Optional[float]:
+        """Seconds since the leader last wrote the snapshot"""
+        snapshot = self.read()
+        return time.time() - snapshot['updated_at'] if snapshot else None
+
+
+class CommandSpool:
+    """
+    Directory of control commands sent by the other workers to the leader.
+    Commands older than `max_age` seconds (e.g. left over from a leader that
+    died) are dropped instead of being replayed.
+    """
+
+    def __init__(self, directory: Path, max_age: float = 60):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+
+    def send(self, command: str, command_id: Optional[str] = None, **params) -> str:
+        """Queue a command for the leader; returns its id"""
+        command_id = command_id or uuid.uuid4().hex
+        name = f'{time.time_ns():020d}-{command_id}.json'
+        data = dict(params, command=command, id=command_id, sent_at=time.time())
+        atomic_write_json(self.directory / name, data, indent=None)
+        return command_id
+
+    def find(self, command_id: str) -> Optional[dict]:
+        """A command still waiting for (or being handled by) the leader"""
+        for path in self.directory.glob(f'*-{command_id}.json'):
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return None
+        return None
+
+    def receive(self) -> List[dict]:
+        """Pending commands, oldest first; acknowledge() them once handled"""
+        commands = []
+        for path in sorted(self.directory.glob('*.json')):
+            try:
+                with open(path, 'r') as f:
+                    command = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠️ Dropping unreadable command {path.name}: {e}")
+                path.unlink(missing_ok=True)
+                continue
+            if time.time() - command.get('sent_at', 0) > self.max_age:
+                logger.warning(f"⚠️ Dropping stale command: {command.get('command')}")
+                path.unlink(missing_ok=True)
+                continue
+            command['path'] = str(path)
+            commands.append(command)
+        return commands
+
+    def acknowledge(self, commands: List[dict]):
+        for command in commands:
+            Path(command['path']).unlink(missing_ok=True)
+
+
+class WorkerRegistry:
+    """
+    Presence files of the workers that are not the leader, touched every few
+    seconds, so the leader only shares its state when someone reads it
+    """
+
+    def __init__(self, directory: Path, max_age: float = 10.0):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.path = self.directory / str(os.getpid())
+
+    def heartbeat(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path.touch()
+
+    def others(self) -> int:
+        """Live workers besides this one; presence files of dead workers are removed"""
+        count = 0
+        try:
+            paths = list(self.directory.iterdir())
+        except FileNotFoundError:
+            return 0
+        for path in paths:
+            if path == self.path:
+                continue
+            try:
+                if time.time() - path.stat().st_mtime <= self.max_age:
+                    count += 1
+                else:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+        return count
+
+    def leave(self):
+        self.path.unlink(missing_ok=True)
+
+
+class Coordinator:
+    """Leader lock, shared snapshot, command spool and worker presence under one directory"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.lock = LeaderLock(self.directory / 'leader.lock')
+        self.snapshot = SharedSnapshot(self.directory / 'snapshot.json')
+        self.commands = CommandSpool(self.directory / 'commands')
+        self.workers = WorkerRegistry(self.directory / 'workers')
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock.held
+
+    def try_lead(self) -> bool:
+        """Become the leader if no other worker is"""
+        was_leader = self.lock.held
+        if self.lock.acquire() and not was_leader:
+            logger.info(f"👑 Worker {os.getpid()} is the leader")
+        return self.lock.held
@@ -0,0 +1,167 @@
+"""
+GitHub Follower Bot - List Enumeration
+Read-only enumeration of follower/following logins with concurrent page fetches
+
+Created by: dewhush
+"""
+
+import logging
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+_LINK = re.compile(r'<([^>]+)>;\s*rel="(\w+)"')
+
+
+def parse_link_header(header: Optional[str]) -> dict:
+    """Map each `rel` of a Link header to its URL"""
+    return {rel: url for url, rel in _LINK.findall(header or '')}
+
+
+def last_page(header: Optional[str]) -> Optional[int]:
+    """Page number of the `rel="last"` link, None if there is none"""
+    url = parse_link_header(header).get('last')
+    if not url:
+        return None
+    page = parse_qs(urlparse(url).query).get('page')
+    return int(page[0]) if page else None
+
+
+class LoginLister:
+    """
+    Enumerates the logins of a paginated user listing (followers, following).
+    The first page tells how many pages there are (Link rel="last"); the rest
+    are fetched concurrently over a bounded pool and yielded in page order.
+    Only for reads: follows and unfollows stay serial on the caller's thread.
+    """
+
+    def __init__(self, requester, per_page: int = 100, concurrency: int = 4,
+                 budget: Optional[Callable[[], Optional[int]]] = None):
+        self.requester = requester
+        self.per_page = per_page
+        self.concurrency = concurrency
+        # Requests we may still spend (rate limit minus reserve), None if unknown
+        self.budget = budget
+
+    def _page(self, path: str, page: int) -> Tuple[dict, List[str]]:
+        headers, data = self.requester.requestJsonAndCheck(
+            'GET', path, parameters={'per_page': self.per_page, 'page': page}
+        )
+        return headers, [user['login'] for user in data]
+
+    def pool_size(self, pages: int) -> int:
+        """Concurrent fetches for `pages` pages, shrinking as the API budget runs low"""
+        size = min(self.concurrency, pages)
+        budget = self.budget() if self.budget else None
+        if budget is not None:
+            # With less budget than pages, the rate limiter will pause anyway
+            size = min(size, budget // pages)
+        return max(size, 1)
+
+    def logins(self, path: str, concurrent: bool = True) -> Iterator[str]:
+        """Yield every login of the listing at `path`, in API order"""
+        headers, logins = self._page(path, 1)
+        yield from logins
+
+        pages = last_page(headers.get('link'))
+        if pages is None:
+            # No page count: follow rel="next" one page at a time
+            page = 1
+            while 'next' in parse_link_header(headers.get('link')):
+                page += 1
+                headers, logins = self._page(path, page)
+                yield from logins
+            return
+
+        workers = self.pool_size(pages - 1) if concurrent else 1
+        if workers == 1:
+            for page in range(2, pages + 1):
+                yield from self._page(path, page)[1]
+            return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='listing') as pool:
+            window = deque()
+            next_page = 2
+            try:
+                while window or next_page <= pages:
+                    # Keep a bounded number of pages in flight or buffered
+                    while next_page <= pages and len(window) < workers * 2:
+                        window.append(pool.submit(self._page, path, next_page))
+                        next_page += 1
+                    yield from window.popleft().result()[1]
+            finally:
+                for future in window:
+                    future.cancel()
+
+
+# ============== GraphQL ==============
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL response carries errors instead of data"""
+
+
+# Viewer connection queried for each REST listing path
+GRAPHQL_CONNECTIONS = {
+    '/user/followers': 'followers',
+    '/user/following': 'following',
+}
+
+_LOGINS_QUERY = """
+query($first: Int!, $after: String) {
+  viewer {
+    %s(first: $first, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      nodes { login }
+    }
+  }
+}
+"""
+
+
+class GraphQLLoginLister:
+    """
+    Same listings as LoginLister, over GraphQL: each page asks for `login`
+    only, so responses are a fraction of the REST user objects and count
+    against the separate GraphQL quota. Pages are cursor-linked, so they are
+    fetched one after another.
+    """
+
+    def __init__(self, requester, url: str = '/graphql', per_page: int = 100):
+        self.requester = requester
+        self.url = url
+        self.per_page = min(per_page, 100)
+
+    def _page(self, connection: str, after: Optional[str]) -> Tuple[dict, List[str]]:
+        _, data = self.requester.requestJsonAndCheck('POST', self.url, input={
+            'query': _LOGINS_QUERY % connection,
+            'variables': {'first': self.per_page, 'after': after},
+        })
+        if data.get('errors'):
+            raise GraphQLError('; '.join(error.get('message', '?') for error in data['errors']))
+        result = data['data']['viewer'][connection]
+        return result['pageInfo'], [node['login'] for node in result['nodes'] if node]
+
+    def logins(self, path: str, concurrent: bool = True) -> Iterator[str]:
+        """Yield every login of the listing at `path`, in API order"""
+        connection = GRAPHQL_CONNECTIONS.get(path)
+        if not connection:
+            raise ValueError(f"No GraphQL listing for {path}")
+        after = None
+        while True:
+            page_info, logins = self._page(connection, after)
+            yield from logins
+            if not page_info['hasNextPage']:
+                return
+            after = page_info['endCursor']
+
+
+def graphql_url(base_url: str) -> str:
+    """GraphQL endpoint for a REST base URL (GitHub Enterprise serves it at /api/graphql)"""
+    path = urlparse(base_url).path.rstrip('/')
+    if path.endswith('/api/v3'):
+        return base_url.rstrip('/')[:-len('/v3')] + '/graphql'
+    return '/graphql'
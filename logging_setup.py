@@ -0,0 +1,91 @@
+"""
+GitHub Follower Bot - Logging
+Queue-based logging with a background writer and rotating log files
+
+Created by: dewhush
+"""
+
+import json
+import logging
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+DEFAULTS = {
+    'level': 'INFO',
+    'file': 'github_autofollow.log',
+    'max_bytes': 10 * 1024 * 1024,
+    'backup_count': 5,
+    'rotate_hours': 24,
+}
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """Rotates to numbered backups when the file exceeds `maxBytes` or gets older than `interval` seconds"""
+
+    def __init__(self, filename: str, interval: Optional[float] = None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.interval = interval
+        self.rollover_at = time.time() + interval if interval else None
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rollover_at and time.time() >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = time.time() + self.interval
+
+
+def load_logging_config(config_path: str = 'config.json') -> dict:
+    """The `logging` section of the bot configuration, with defaults"""
+    options = dict(DEFAULTS)
+    try:
+        with open(config_path, 'r') as f:
+            options.update(json.load(f).get('logging', {}))
+    except (OSError, json.JSONDecodeError, AttributeError):
+        pass
+    return options
+
+
+def setup_logging(options: Optional[dict] = None) -> QueueListener:
+    """
+    Route all log records through an in-memory queue to a background thread
+    writing stdout and the rotating log file. Call once at startup and stop()
+    the returned listener on shutdown to drain the queue.
+    """
+    options = dict(DEFAULTS, **(options or {}))
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if options.get('file'):
+        Path(options['file']).parent.mkdir(parents=True, exist_ok=True)
+        rotate_hours = options.get('rotate_hours')
+        handlers.append(SizeAndTimeRotatingFileHandler(
+            options['file'],
+            interval=rotate_hours * 3600 if rotate_hours else None,
+            maxBytes=options.get('max_bytes') or 0,
+            backupCount=options.get('backup_count', 5),
+            encoding='utf-8'
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(options.get('level', 'INFO'))
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,228 @@
+"""
+GitHub Follower Bot - Metrics
+Minimal Prometheus text-format metrics (no extra dependency)
+
+Created by: dewhush
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from transport import Request, Response
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ''
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}' for k, v in items]
+
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a `with` block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f'{self.name}_bucket{labels} {bucket_count}')
+            labels = _format_labels(self.label_names, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+PHASE_DURATION = REGISTRY.register(Histogram(
+    'github_bot_phase_duration_seconds', 'Duration of each run_cycle phase', ['phase']
+))
+CYCLE_DURATION = REGISTRY.register(Histogram(
+    'github_bot_cycle_duration_seconds', 'Duration of a complete run_cycle'
+))
+API_REQUESTS = REGISTRY.register(Counter(
+    'github_api_requests_total', 'GitHub API requests sent', ['method', 'endpoint', 'status']
+))
+API_LATENCY = REGISTRY.register(Histogram(
+    'github_api_request_duration_seconds', 'GitHub API request latency', ['method', 'endpoint']
+))
+RATE_LIMIT_REMAINING = REGISTRY.register(Gauge(
+    'github_api_rate_limit_remaining', 'Requests left in the current rate-limit window', ['resource']
+))
+RATE_LIMIT_LIMIT = REGISTRY.register(Gauge(
+    'github_api_rate_limit_limit', 'Size of the rate-limit window', ['resource']
+))
+STATE_FLUSH_DURATION = REGISTRY.register(Histogram(
+    'github_bot_state_flush_duration_seconds', 'Duration of state flushes'
+))
+TELEGRAM_LATENCY = REGISTRY.register(Histogram(
+    'github_bot_telegram_send_duration_seconds', 'Telegram sendMessage latency', ['outcome']
+))
+TELEGRAM_MESSAGES = REGISTRY.register(Counter(
+    'github_bot_telegram_messages_total', 'Telegram notifications by final outcome', ['outcome']
+))
+TELEGRAM_RETRIES = REGISTRY.register(Counter(
+    'github_bot_telegram_retries_total', 'Telegram sendMessage retries'
+))
+TELEGRAM_QUEUE = REGISTRY.register(Gauge(
+    'github_bot_telegram_queue_length', 'Telegram notifications waiting to be sent'
+))
+SSE_CLIENTS = REGISTRY.register(Gauge(
+    'github_bot_event_stream_clients', 'Clients connected to /v1/events'
+))
+SSE_DROPPED = REGISTRY.register(Counter(
+    'github_bot_event_stream_dropped_total', 'Event stream clients disconnected for falling behind'
+))
+
+
+# ============== GitHub API Instrumentation ==============
+
+_ENDPOINT_PATTERNS = [
+    (re.compile(r'^/user/following/[^/]+$'), '/user/following/{login}'),
+    (re.compile(r'^/users/[^/]+/(followers|following)$'), r'/users/{login}/\1'),
+    (re.compile(r'^/users/[^/]+$'), '/users/{login}'),
+    (re.compile(r'^/repos/[^/]+/[^/]+/stargazers$'), '/repos/{owner}/{repo}/stargazers'),
+    (re.compile(r'^/repos/[^/]+/[^/]+$'), '/repos/{owner}/{repo}'),
+    (re.compile(r'^/user/starred/[^/]+/[^/]+$'), '/user/starred/{owner}/{repo}'),
+]
+
+
+def endpoint_label(url: str) -> str:
+    """Collapse a request URL to a low-cardinality endpoint template"""
+    path = url.split('?', 1)[0]
+    if path.startswith('/api/v3/'):
+        path = path[len('/api/v3'):]
+    for pattern, template in _ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return path
+
+
+class MetricsMiddleware:
+    """Transport middleware recording request counts, latency and rate-limit gauges"""
+
+    def __call__(self, request: Request, send) -> Response:
+        endpoint = endpoint_label(request.url)
+        started = time.perf_counter()
+        status: Optional[int] = None
+        try:
+            response = send(request)
+            status = response.status
+        finally:
+            API_LATENCY.observe(time.perf_counter() - started, method=request.verb, endpoint=endpoint)
+            API_REQUESTS.inc(method=request.verb, endpoint=endpoint, status=status or 'error')
+
+        headers = response.headers
+        if 'x-ratelimit-remaining' in headers:
+            resource = headers.get('x-ratelimit-resource', 'core')
+            RATE_LIMIT_REMAINING.set(float(headers['x-ratelimit-remaining']), resource=resource)
+            if 'x-ratelimit-limit' in headers:
+                RATE_LIMIT_LIMIT.set(float(headers['x-ratelimit-limit']), resource=resource)
+        return response
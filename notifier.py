@@ -0,0 +1,192 @@
+"""
+GitHub Follower Bot - Telegram Notifier
+Background Telegram delivery so bot cycles never wait on the Telegram API
+
+Created by: dewhush
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+from metrics import TELEGRAM_LATENCY, TELEGRAM_MESSAGES, TELEGRAM_QUEUE, TELEGRAM_RETRIES
+
+logger = logging.getLogger(__name__)
+
+# Telegram rejects longer messages
+MAX_MESSAGE_LENGTH = 4096
+
+
+class TelegramNotifier:
+    """
+    Sends Telegram messages from a daemon thread over one keep-alive session.
+    - notify() only queues the message; the queue is bounded and drops the
+      oldest message when full
+    - Messages queued within `coalesce_seconds` are joined into one sendMessage
+    - Network errors, 429 and 5xx answers are retried with exponential backoff
+      (or Telegram's `retry_after`); other errors drop the message
+    """
+
+    def __init__(self, token: str, chat_id: str, session: Callable, coalesce_seconds: float = 2.0,
+                 max_queue: int = 100, max_retries: int = 3, backoff: float = 1.0, timeout: float = 10):
+        self.url = f"https://api.telegram.org/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.session = session
+        self.coalesce_seconds = coalesce_seconds
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.counters = {'queued': 0, 'sent': 0, 'batches': 0, 'retries': 0, 'dropped': 0, 'failed': 0}
+        self.last_latency: Optional[float] = None
+        self._queue = deque()
+        self._counters_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._closing = threading.Event()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    def _count(self, name: str, amount: int = 1):
+        with self._counters_lock:
+            self.counters[name] += amount
+        if name in ('sent', 'dropped', 'failed'):
+            TELEGRAM_MESSAGES.inc(amount, outcome=name)
+
+    def notify(self, message: str):
+        """Queue a message for delivery"""
+        with self._cond:
+            if self._closing.is_set():
+                self._count('dropped')
+                return
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self._count('dropped')
+                logger.warning("⚠️ Telegram queue full, dropped the oldest message")
+            self._queue.append(message)
+            self._count('queued')
+            TELEGRAM_QUEUE.set(len(self._queue))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='telegram', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message was handled; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10):
+        """Send what is queued (without coalescing delay or retries), then stop"""
+        self._closing.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+        with self._cond:
+            if self._queue:
+                self._count('dropped', len(self._queue))
+                self._queue.clear()
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending = len(self._queue)
+        with self._counters_lock:
+            counters = dict(self.counters)
+        return dict(
+            counters,
+            pending=pending,
+            last_latency_seconds=round(self.last_latency, 4) if self.last_latency is not None else None
+        )
+
+    # ============== Delivery Thread ==============
+
+    def _next_batch(self) -> List[str]:
+        """Wait for a message, then collect those arriving within the coalescing window"""
+        with self._cond:
+            while not self._queue:
+                if self._closing.is_set():
+                    return []
+                self._cond.wait()
+            deadline = time.monotonic() + self.coalesce_seconds
+            while not self._closing.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = list(self._queue)
+            self._queue.clear()
+            self._busy = True
+            TELEGRAM_QUEUE.set(0)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                for text, count in _join(batch):
+                    self._count('batches')
+                    self._count('sent' if self._deliver(text) else 'failed', count)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _deliver(self, text: str) -> bool:
+        data = {'chat_id': self.chat_id, 'text': text, 'parse_mode': 'HTML'}
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            outcome = 'error'
+            delay = self.backoff * 2 ** attempt
+            try:
+                response = self.session().post(self.url, data=data, timeout=self.timeout)
+                outcome = 'ok' if response.ok else 'failed'
+                if response.ok:
+                    return True
+                if response.status_code != 429 and response.status_code < 500:
+                    logger.warning(f"⚠️ Telegram rejected a message: HTTP {response.status_code}")
+                    return False
+                if response.status_code == 429:
+                    delay = _retry_after(response, delay)
+            except Exception as e:
+                logger.warning(f"⚠️ Telegram notification error: {e}")
+            finally:
+                self.last_latency = time.perf_counter() - started
+                TELEGRAM_LATENCY.observe(self.last_latency, outcome=outcome)
+            if attempt == self.max_retries or self._closing.is_set():
+                break
+            self._count('retries')
+            TELEGRAM_RETRIES.inc()
+            if self._closing.wait(delay):
+                break
+        return False
+
+
+def _retry_after(response, default: float) -> float:
+    try:
+        return float(response.json()['parameters']['retry_after'])
+    except Exception:
+        return default
+
+
+def _join(messages: List[str]):
+    """Group messages into texts within Telegram's length limit; yields (text, message count)"""
+    parts: List[str] = []
+    size = 0
+    for message in messages:
+        if parts and size + len(message) + 2 > MAX_MESSAGE_LENGTH:
+            yield '\n\n'.join(parts), len(parts)
+            parts, size = [], 0
+        parts.append(message)
+        size += len(message) + 2
+    if parts:
+        yield '\n\n'.join(parts), len(parts)
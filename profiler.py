@@ -0,0 +1,189 @@
+"""
+GitHub Follower Bot - Sampling Profiler
+On-demand statistical profiler for the bot threads of a running cycle
+
+Created by: dewhush
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Bot worker, listing prefetch pool and Telegram delivery threads
+THREAD_PREFIXES = ('bot-worker', 'listing', 'telegram')
+
+CATEGORIES = ('cpu', 'json', 'github', 'telegram', 'wait')
+
+_STDLIB = os.path.dirname(os.__file__)
+_JSON_DIR = os.path.join(_STDLIB, 'json') + os.sep
+_NETWORK_FILES = tuple(os.path.join(_STDLIB, name) for name in ('socket.py', 'ssl.py', 'selectors.py'))
+_HTTP_CLIENT = os.path.join(_STDLIB, 'http', 'client.py')
+_THREAD_POOL = os.path.join(_STDLIB, 'concurrent', 'futures', 'thread.py')
+_WAIT_FILES = (os.path.join(_STDLIB, 'threading.py'), os.path.join(_STDLIB, 'queue.py'))
+
+Stack = Tuple[object, ...]  # code objects, outermost first
+
+
+def _is_network(filename: str) -> bool:
+    return (filename in _NETWORK_FILES or filename == _HTTP_CLIENT
+            or f'{os.sep}urllib3{os.sep}' in filename)
+
+
+def categorize(stack: Stack) -> Optional[str]:
+    """Where a sample spends its time, None for a thread idle between tasks"""
+    if any(code.co_name == '_next_batch' and code.co_filename.endswith('notifier.py') for code in stack):
+        return None
+    # A pool thread waiting for its next work item (SimpleQueue.get has no Python frame)
+    if stack and stack[-1].co_filename == _THREAD_POOL:
+        return None
+    for code in reversed(stack):
+        filename = code.co_filename
+        if filename.startswith(_JSON_DIR):
+            return 'json'
+        # PyGithub sleeps there to space requests out (seconds_between_requests)
+        if _is_network(filename) or code.co_name == '__deferRequest':
+            if any(c.co_filename.endswith('notifier.py') for c in stack):
+                return 'telegram'
+            return 'github'
+    # Delays between actions, rate-limit pauses, locks and other threads
+    if stack and stack[-1].co_filename in _WAIT_FILES:
+        return 'wait'
+    return 'cpu'
+
+
+def _frame_name(code) -> str:
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+class Profile:
+    """Stack samples of one profiling run, grouped by category and thread"""
+
+    def __init__(self, samples: Counter, ticks: int, duration: float, idle: int):
+        self.samples = samples  # (category, thread name, stack) -> count
+        self.ticks = ticks
+        self.duration = duration
+        self.idle = idle
+        # Measured, so late ticks of a busy process are not under-counted
+        self.sample_seconds = duration / ticks if ticks else 0.0
+
+    def summary(self) -> dict:
+        """Seconds of sampled thread time per category"""
+        seconds = dict.fromkeys(CATEGORIES, 0.0)
+        for (category, _, _), count in self.samples.items():
+            seconds[category] += count * self.sample_seconds
+        return {
+            'duration_seconds': round(self.duration, 3),
+            'samples': sum(self.samples.values()),
+            'idle_samples': self.idle,
+            'categories': {name: round(value, 3) for name, value in seconds.items()},
+        }
+
+    def to_collapsed(self) -> str:
+        """Collapsed stacks ("category;thread;frame;frame count"), e.g. for flamegraph.pl"""
+        lines = Counter()
+        for (category, thread, stack), count in self.samples.items():
+            frames = ';'.join(_frame_name(code) for code in stack)
+            lines[f'[{category}];{thread};{frames}'] += count
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(lines.items()))
+
+    def to_speedscope(self) -> dict:
+        """Speedscope file, one sampled profile per thread, each stack rooted at its category"""
+        frames: List[dict] = []
+        index: Dict[object, int] = {}
+
+        def frame_index(key, **frame) -> int:
+            if key not in index:
+                index[key] = len(frames)
+                frames.append(frame)
+            return index[key]
+
+        threads: Dict[str, dict] = {}
+        for (category, thread, stack), count in sorted(self.samples.items(), key=lambda item: item[0][1]):
+            profile = threads.setdefault(thread, {
+                'type': 'sampled', 'name': thread, 'unit': 'seconds',
+                'startValue': 0, 'endValue': round(self.duration, 6), 'samples': [], 'weights': [],
+            })
+            path = [frame_index(category, name=f'[{category}]')]
+            path.extend(
+                frame_index(code, name=code.co_name, file=code.co_filename, line=code.co_firstlineno)
+                for code in stack
+            )
+            profile['samples'].append(path)
+            profile['weights'].append(round(count * self.sample_seconds, 6))
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': f'GitHub Follower Bot ({self.duration:.1f}s)',
+            'exporter': 'github-follower-bot',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': list(threads.values()),
+            'summary': self.summary(),
+        }
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: while profile() runs, a thread reads the stacks of
+    the bot threads with sys._current_frames() every `interval` seconds.
+    Nothing is installed in the profiled threads, so there is no cost at all
+    outside a profile. One profile runs at a time.
+    """
+
+    def __init__(self, interval: float = 0.01, thread_prefixes: Sequence[str] = THREAD_PREFIXES):
+        self.interval = interval
+        self.thread_prefixes = tuple(thread_prefixes)
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def _threads(self) -> Dict[int, str]:
+        return {
+            thread.ident: thread.name for thread in threading.enumerate()
+            if thread.ident and thread.name.startswith(self.thread_prefixes)
+        }
+
+    def profile(self, seconds: float) -> Profile:
+        """Sample the bot threads for `seconds` (blocking)"""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            samples: Counter = Counter()
+            ticks = idle = 0
+            threads: Dict[int, str] = {}
+            refreshed = 0.0
+            started = time.perf_counter()
+            deadline = started + seconds
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                # Pool threads come and go (e.g. listing), but not every few ms
+                if now - refreshed >= 0.5:
+                    threads, refreshed = self._threads(), now
+                frames = sys._current_frames()
+                ticks += 1
+                for ident, name in threads.items():
+                    frame = frames.get(ident)
+                    if frame is None:
+                        continue
+                    codes = []
+                    while frame is not None:
+                        codes.append(frame.f_code)
+                        frame = frame.f_back
+                    stack = tuple(reversed(codes))
+                    category = categorize(stack)
+                    if category is None:
+                        idle += 1
+                    else:
+                        samples[(category, name, stack)] += 1
+                del frames
+                time.sleep(max(0.0, self.interval - (time.perf_counter() - now)))
+            return Profile(samples, ticks, time.perf_counter() - started, idle)
+        finally:
+            self._lock.release()
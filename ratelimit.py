@@ -0,0 +1,193 @@
+"""
+GitHub Follower Bot - Rate Limiting
+Quota-aware request scheduling and follow limits
+
+Created by: dewhush
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Callable, Dict, Optional
+
+from transport import Request, Response
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaExhausted(Exception):
+    """Raised when a request cannot be made without breaking the API quota"""
+
+
+class RateLimitScheduler:
+    """
+    Transport middleware that tracks the GitHub quota from response headers:
+    - X-RateLimit-Remaining / X-RateLimit-Reset, per resource (core, graphql, ...)
+    - Retry-After on secondary rate limits
+    Requests are held back once the remaining budget drops to `reserve`, until
+    the window resets, instead of being sent just to fail.
+    `on_change` receives the new state of a bucket (at most every
+    `notify_interval` seconds per resource, since every request changes it)
+    and every pause.
+    """
+
+    def __init__(self, wait: Callable[[float], bool], reserve: int = 50, max_wait: float = 900,
+                 on_change: Optional[Callable[[dict], None]] = None, notify_interval: float = 1.0):
+        self.wait = wait
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.on_change = on_change
+        self.notify_interval = notify_interval
+        self.buckets: Dict[str, dict] = {}
+        self.retry_after_until = 0.0
+        self._notified: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _resource(request: Request) -> str:
+        return 'graphql' if request.url.rstrip('/').endswith('/graphql') else 'core'
+
+    def _notify(self, change: dict):
+        if self.on_change:
+            try:
+                self.on_change(change)
+            except Exception as e:
+                logger.warning(f"⚠️ Rate limit listener failed: {e}")
+
+    def _pause(self, seconds: float, reason: str):
+        if seconds > self.max_wait:
+            raise QuotaExhausted(f"{reason}, resets in {int(seconds)}s")
+        logger.warning(f"⏳ {reason}, pausing {int(seconds)}s")
+        self._notify({'paused_seconds': int(seconds), 'reason': reason})
+        if not self.wait(seconds):
+            raise QuotaExhausted(f"{reason}, wait cancelled")
+
+    def _before(self, resource: str):
+        now = time.time()
+        if self.retry_after_until > now:
+            self._pause(self.retry_after_until - now, "Secondary rate limit")
+        bucket = self.buckets.get(resource)
+        if bucket and bucket['remaining'] <= self.reserve and bucket['reset'] > now:
+            self._pause(bucket['reset'] - now + 1, f"API quota low ({bucket['remaining']} left)")
+
+    def _update(self, resource: str, response: Response):
+        headers = response.headers
+        change = None
+        with self._lock:
+            if 'x-ratelimit-remaining' in headers:
+                resource = headers.get('x-ratelimit-resource', resource)
+                bucket = {
+                    'remaining': int(float(headers['x-ratelimit-remaining'])),
+                    'limit': int(float(headers.get('x-ratelimit-limit', 0))),
+                    'reset': int(float(headers.get('x-ratelimit-reset', 0))),
+                }
+                previous = self.buckets.get(resource)
+                self.buckets[resource] = bucket
+                now = time.monotonic()
+                if bucket != previous and (
+                    # A new window is always reported
+                    not previous or bucket['reset'] != previous['reset']
+                    or now - self._notified.get(resource, 0) >= self.notify_interval
+                ):
+                    self._notified[resource] = now
+                    change = dict(self._bucket_status(bucket), resource=resource)
+            if response.status in (403, 429) and 'retry-after' in headers:
+                self.retry_after_until = time.time() + float(headers['retry-after'])
+        if change:
+            self._notify(change)
+
+    def __call__(self, request: Request, send) -> Response:
+        resource = self._resource(request)
+        self._before(resource)
+        response = send(request)
+        self._update(resource, response)
+
+        if response.status in (403, 429):
+            bucket = self.buckets.get(resource, {})
+            if 'retry-after' in response.headers:
+                self._pause(self.retry_after_until - time.time(), "Secondary rate limit")
+            elif bucket.get('remaining') == 0:
+                self._pause(bucket['reset'] - time.time() + 1, "API quota exhausted")
+            else:
+                return response
+            # Retry once after the limit window
+            response = send(request)
+            self._update(resource, response)
+        return response
+
+    def remaining(self, resource: str = 'core') -> Optional[int]:
+        """Remaining requests in the current window, None if not known yet"""
+        bucket = self.buckets.get(resource)
+        return bucket['remaining'] if bucket else None
+
+    def can_afford(self, requests: int, resource: str = 'core') -> bool:
+        """Whether `requests` more calls fit in the budget above the reserve"""
+        bucket = self.buckets.get(resource)
+        if not bucket or bucket['reset'] <= time.time():
+            return True
+        return bucket['remaining'] - self.reserve >= requests
+
+    @staticmethod
+    def _bucket_status(bucket: dict) -> dict:
+        return {
+            'remaining': bucket['remaining'],
+            'limit': bucket['limit'],
+            'resets_at': datetime.fromtimestamp(bucket['reset']).isoformat() if bucket['reset'] else None,
+        }
+
+    def status(self) -> dict:
+        # Called from the event loop while other threads add buckets
+        with self._lock:
+            buckets = dict(self.buckets)
+        return {resource: self._bucket_status(bucket) for resource, bucket in buckets.items()}
+
+
+class FollowLimiter:
+    """Enforces the hourly and daily follow limits from the farming config"""
+
+    def __init__(self, hourly_limit: int, daily_limit: int, state: Optional[dict] = None):
+        self.hourly_limit = hourly_limit
+        self.daily_limit = daily_limit
+        state = state or {}
+        self.today = state.get('today', date.today().isoformat())
+        self.follows_today = state.get('follows_today', 0)
+        self.recent = deque(t for t in state.get('recent', []) if t > time.time() - 3600)
+        self._roll()
+
+    def _roll(self):
+        today = date.today().isoformat()
+        if self.today != today:
+            self.today = today
+            self.follows_today = 0
+        cutoff = time.time() - 3600
+        while self.recent and self.recent[0] <= cutoff:
+            self.recent.popleft()
+
+    def available(self) -> int:
+        """Follows still allowed right now"""
+        self._roll()
+        return max(0, min(self.hourly_limit - len(self.recent), self.daily_limit - self.follows_today))
+
+    def record(self):
+        """Count one successful follow"""
+        self._roll()
+        self.recent.append(time.time())
+        self.follows_today += 1
+
+    def to_dict(self) -> dict:
+        return {'today': self.today, 'follows_today': self.follows_today, 'recent': list(self.recent)}
+
+    def status(self) -> dict:
+        """Current counts, without rolling the windows (called from the event loop thread)"""
+        cutoff = time.time() - 3600
+        last_hour = sum(1 for t in list(self.recent) if t > cutoff)
+        today = self.follows_today if self.today == date.today().isoformat() else 0
+        return {
+            'hourly_limit': self.hourly_limit,
+            'follows_last_hour': last_hour,
+            'daily_limit': self.daily_limit,
+            'follows_today': today,
+            'available': max(0, min(self.hourly_limit - last_hour, self.daily_limit - today)),
+        }
@@ -0,0 +1,132 @@
+"""
+GitHub Follower Bot - Cycle Scheduler
+Runs bot cycles periodically in a single, interruptible loop
+
+Created by: dewhush
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CycleScheduler:
+    """
+    Background loop running the blocking `run_cycle` through `submit` (the
+    bot worker) every `interval` seconds.
+    - At most one loop: a start right after a stop waits for the old loop
+      to finish its interrupted cycle before the first new one
+    - The sleep between cycles is an event wait, so stop() and wake()
+      take effect immediately
+    - stop() calls `cancel` only while a cycle of this scheduler runs on the
+      worker, never for other work (e.g. a manual job); a cycle still queued
+      behind such work is skipped instead
+    """
+
+    def __init__(self, submit: Callable[[Callable[[], Any]], Awaitable], run_cycle: Callable[[], Any],
+                 cancel: Callable[[], None], reset_cancel: Callable[[], None]):
+        self.submit = submit
+        self.run_cycle = run_cycle
+        self.cancel = cancel
+        self.reset_cancel = reset_cancel
+        self.interval = 300.0
+        self.cycles = 0
+        self.last_cycle_started: Optional[datetime] = None
+        self.last_cycle_finished: Optional[datetime] = None
+        self.next_cycle_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._wake: Optional[asyncio.Event] = None
+        # Guards the stop check and cancel-flag reset on the worker against stop()
+        self._cycle_lock = threading.Lock()
+        self._cycle_running = False
+
+    @property
+    def running(self) -> bool:
+        """A loop is active and has not been asked to stop"""
+        return self._task is not None and not self._task.done() and not self._stop.is_set()
+
+    def start(self, interval: float) -> bool:
+        """Start the loop; returns False if it is already running"""
+        if self.running:
+            return False
+        self.interval = interval
+        previous = self._task
+        self._stop = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(self._stop, self._wake, previous))
+        return True
+
+    def stop(self) -> bool:
+        """Stop the loop and interrupt the running cycle; returns False if not running"""
+        if not self.running:
+            return False
+        with self._cycle_lock:
+            self._stop.set()
+            if self._cycle_running:
+                self.cancel()
+        self._wake.set()
+        self.next_cycle_at = None
+        return True
+
+    def wake(self):
+        """Run the next cycle now instead of waiting for the interval"""
+        if self.running:
+            self._wake.set()
+
+    async def join(self, timeout: Optional[float] = None):
+        """Wait for the loop to exit (after stop())"""
+        if self._task:
+            await asyncio.wait([self._task], timeout=timeout)
+
+    def _cycle(self, stop: asyncio.Event):
+        """One cycle on the worker thread, unless the loop was stopped while it was queued"""
+        with self._cycle_lock:
+            if stop.is_set():
+                logger.info("⏭️ Scheduler stopped, skipping the queued cycle")
+                return
+            self.reset_cancel()
+            self._cycle_running = True
+        try:
+            self.run_cycle()
+        finally:
+            with self._cycle_lock:
+                self._cycle_running = False
+
+    async def _loop(self, stop: asyncio.Event, wake: asyncio.Event, previous: Optional[asyncio.Task]):
+        if previous:
+            await asyncio.wait([previous])
+        logger.info(f"▶️ Cycle scheduler started (every {int(self.interval)}s)")
+        while not stop.is_set():
+            self.last_cycle_started = datetime.now()
+            try:
+                await self.submit(lambda: self._cycle(stop))
+            except Exception as e:
+                logger.error(f"❌ Cycle failed: {e}")
+            self.cycles += 1
+            self.last_cycle_finished = datetime.now()
+            if stop.is_set():
+                break
+
+            self.next_cycle_at = datetime.now() + timedelta(seconds=self.interval)
+            wake.clear()
+            try:
+                await asyncio.wait_for(wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+        self.next_cycle_at = None
+        logger.info("🛑 Cycle scheduler stopped")
+
+    def status(self) -> dict:
+        return {
+            'running': self.running,
+            'interval_seconds': self.interval,
+            'cycles': self.cycles,
+            'last_cycle_started': self.last_cycle_started.isoformat() if self.last_cycle_started else None,
+            'last_cycle_finished': self.last_cycle_finished.isoformat() if self.last_cycle_finished else None,
+            'next_cycle_at': self.next_cycle_at.isoformat() if self.next_cycle_at else None,
+        }
@@ -0,0 +1,93 @@
+"""
+GitHub Follower Bot - Spilled Login Sets
+Disk-backed sorted login runs and merge joins for memory-bounded set operations
+
+Created by: dewhush
+"""
+
+import heapq
+import logging
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _read_run(path: Path) -> Iterator[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
+def sorted_difference(left: Iterable[str], right: Iterable[str]) -> Iterator[str]:
+    """Items of `left` missing from `right`; both sorted and without duplicates"""
+    right = iter(right)
+    current = next(right, None)
+    for item in left:
+        while current is not None and current < item:
+            current = next(right, None)
+        if current != item:
+            yield item
+
+
+class SortedSpill:
+    """
+    Set of logins held as sorted runs: at most `max_items` logins stay in
+    memory, each full buffer is sorted and written to a temporary file.
+    Iterating merges the runs, yielding every login once, in sorted order.
+    """
+
+    def __init__(self, max_items: int, directory: Optional[str] = None):
+        self.max_items = max(int(max_items), 1)
+        self._dir = tempfile.TemporaryDirectory(prefix='spill-', dir=directory)
+        self._buffer: List[str] = []
+        self._runs: List[Path] = []
+        self.added = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, login: str):
+        self._buffer.append(login)
+        self.added += 1
+        if len(self._buffer) >= self.max_items:
+            self._spill()
+
+    def extend(self, logins: Iterable[str]):
+        for login in logins:
+            self.add(login)
+
+    def flush(self):
+        """Write the buffered logins out as a run, freeing their memory"""
+        if self._buffer:
+            self._spill()
+
+    def _spill(self):
+        self._buffer.sort()
+        path = Path(self._dir.name) / f'run-{len(self._runs):05d}.txt'
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(login + '\n' for login in self._buffer)
+        self._runs.append(path)
+        self._buffer = []
+
+    @property
+    def runs(self) -> int:
+        """Runs written to disk so far"""
+        return len(self._runs)
+
+    def __iter__(self) -> Iterator[str]:
+        self._buffer.sort()
+        previous = None
+        for login in heapq.merge(*(_read_run(path) for path in self._runs), iter(self._buffer)):
+            if login != previous:
+                yield login
+                previous = login
+
+    def close(self):
+        self._buffer = []
+        self._runs = []
+        self._dir.cleanup()
@@ -0,0 +1,379 @@
+"""
+GitHub Follower Bot - State Storage
+Pluggable persistence backends for the bot state
+
+Created by: dewhush
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+# Named login sets and the JSON documents the bot keeps
+FOLLOWED_USERS = 'followed_users'
+IGNORED_USERS = 'ignored_users'
+DOCUMENTS = ('farming_stats', 'cleanup_stats', 'starred_repos', 'star_stats')
+
+# Everything imported from the JSON files when switching to SQLite
+MIGRATED_SETS = (FOLLOWED_USERS, IGNORED_USERS)
+MIGRATED_DOCUMENTS = DOCUMENTS + ('follow_limits', 'follower_watermark')
+
+
+def atomic_write_json(path: Path, data: dict, indent: Optional[int] = 2, fsync: bool = True):
+    """Write JSON to a temp file, fsync it (unless `fsync` is False) and rename it over the target"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=str(path.parent or '.'))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class StateStore:
+    """
+    Base interface for bot state persistence:
+    - Named sets of logins (e.g. followed users), updated one row at a time
+    - Named JSON documents (stats), saved as a whole
+    """
+
+    def load_set(self, name: str) -> Set[str]:
+        """Load every login of a named set"""
+        raise NotImplementedError
+
+    def add_to_set(self, name: str, login: str):
+        """Persist a single login added to a named set"""
+        raise NotImplementedError
+
+    def remove_from_set(self, name: str, login: str):
+        """Persist a single login removed from a named set"""
+        raise NotImplementedError
+
+    def contains(self, name: str, login: str) -> bool:
+        """Whether a login is in a named set"""
+        return login in self.load_set(name)
+
+    def count(self, name: str) -> int:
+        """Number of logins in a named set"""
+        return len(self.load_set(name))
+
+    def load_document(self, name: str) -> Optional[dict]:
+        """Load a named document, None if it was never saved"""
+        raise NotImplementedError
+
+    def save_document(self, name: str, data: dict):
+        """Persist a named document"""
+        raise NotImplementedError
+
+    def flush(self, force: bool = False):
+        """Write out any buffered changes"""
+
+    def close(self):
+        """Release any resources held by the store"""
+
+
+class JsonStateStore(StateStore):
+    """Legacy backend: one JSON file per set/document, atomically replaced on every change"""
+
+    def __init__(self, paths: Dict[str, Path]):
+        self.paths = {name: Path(path) for name, path in paths.items()}
+        self._sets: Dict[str, Set[str]] = {}
+
+    def _read(self, name: str) -> Optional[dict]:
+        path = self.paths.get(name)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"⚠️ Could not read {path}: {e}")
+            return None
+
+    def _write(self, name: str, data: dict):
+        atomic_write_json(self.paths[name], data)
+
+    def load_set(self, name: str) -> Set[str]:
+        data = self._read(name) or {}
+        self._sets[name] = set(data.get(name, []))
+        return set(self._sets[name])
+
+    def _logins(self, name: str) -> Set[str]:
+        if name not in self._sets:
+            self.load_set(name)
+        return self._sets[name]
+
+    def _save_set(self, name: str):
+        self._write(name, {
+            name: list(self._sets[name]),
+            'last_updated': datetime.now().isoformat()
+        })
+
+    def add_to_set(self, name: str, login: str):
+        logins = self._logins(name)
+        if login not in logins:
+            logins.add(login)
+            self._save_set(name)
+
+    def remove_from_set(self, name: str, login: str):
+        logins = self._logins(name)
+        if login in logins:
+            logins.discard(login)
+            self._save_set(name)
+
+    def contains(self, name: str, login: str) -> bool:
+        return login in self._logins(name)
+
+    def count(self, name: str) -> int:
+        return len(self._logins(name))
+
+    def load_document(self, name: str) -> Optional[dict]:
+        return self._read(name)
+
+    def save_document(self, name: str, data: dict):
+        self._write(name, data)
+
+
+class SQLiteStateStore(StateStore):
+    """
+    Embedded SQLite backend in WAL mode.
+    Set membership changes are single-row inserts/deletes, so the cost of
+    persisting an action does not grow with the size of the account.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS logins (
+            set_name TEXT NOT NULL,
+            login TEXT NOT NULL,
+            added_at TEXT NOT NULL,
+            PRIMARY KEY (set_name, login)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS documents (
+            name TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+
+    def load_set(self, name: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute('SELECT login FROM logins WHERE set_name = ?', (name,))
+            return {row[0] for row in rows}
+
+    def add_to_set(self, name: str, login: str):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO logins (set_name, login, added_at) VALUES (?, ?, ?)',
+                (name, login, datetime.now().isoformat())
+            )
+
+    def remove_from_set(self, name: str, login: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM logins WHERE set_name = ? AND login = ?', (name, login))
+
+    def contains(self, name: str, login: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT 1 FROM logins WHERE set_name = ? AND login = ?', (name, login)
+            ).fetchone() is not None
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM logins WHERE set_name = ?', (name,)).fetchone()[0]
+
+    def load_document(self, name: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute('SELECT data FROM documents WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_document(self, name: str, data: dict):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO documents (name, data, updated_at) VALUES (?, ?, ?)',
+                (name, json.dumps(data), datetime.now().isoformat())
+            )
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def import_state(self, sets: Dict[str, Iterable[str]], documents: Dict[str, dict]):
+        """Bulk-load sets and documents in a single transaction, keeping documents already stored"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for name, logins in sets.items():
+                    self._conn.executemany(
+                        'INSERT OR IGNORE INTO logins (set_name, login, added_at) VALUES (?, ?, ?)',
+                        ((name, login, now) for login in logins)
+                    )
+                for name, data in documents.items():
+                    self._conn.execute(
+                        'INSERT OR IGNORE INTO documents (name, data, updated_at) VALUES (?, ?, ?)',
+                        (name, json.dumps(data), now)
+                    )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_at', ?)", (now,)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class WriteBehindStore(StateStore):
+    """
+    Write-behind layer over another store.
+    Document saves only mark the document dirty; dirty documents are written
+    at most once every `flush_interval` seconds, or when flushed with force.
+    Set changes go straight through to the wrapped store.
+    """
+
+    def __init__(self, store: StateStore, flush_interval: float = 30.0):
+        self.store = store
+        self.flush_interval = flush_interval
+        self._dirty: Dict[str, dict] = {}
+        self._lock = threading.RLock()
+        self._last_flush = time.monotonic()
+
+    def load_set(self, name: str) -> Set[str]:
+        return self.store.load_set(name)
+
+    def add_to_set(self, name: str, login: str):
+        self.store.add_to_set(name, login)
+
+    def remove_from_set(self, name: str, login: str):
+        self.store.remove_from_set(name, login)
+
+    def contains(self, name: str, login: str) -> bool:
+        return self.store.contains(name, login)
+
+    def count(self, name: str) -> int:
+        return self.store.count(name)
+
+    def load_document(self, name: str) -> Optional[dict]:
+        with self._lock:
+            if name in self._dirty:
+                return self._dirty[name]
+        return self.store.load_document(name)
+
+    def save_document(self, name: str, data: dict):
+        with self._lock:
+            self._dirty[name] = data
+        self.flush()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    def flush(self, force: bool = False):
+        with self._lock:
+            if not self._dirty:
+                return
+            if not force and time.monotonic() - self._last_flush < self.flush_interval:
+                return
+            pending, self._dirty = self._dirty, {}
+            try:
+                for name, data in pending.items():
+                    self.store.save_document(name, data)
+            except Exception:
+                # Keep anything that was not written so the next flush retries it
+                for name, data in pending.items():
+                    self._dirty.setdefault(name, data)
+                raise
+            finally:
+                self._last_flush = time.monotonic()
+        self.store.flush(force)
+
+    def close(self):
+        try:
+            self.flush(force=True)
+        finally:
+            self.store.close()
+
+
+class StoredLoginSet:
+    """
+    Read-only view of a named set that answers lookups from the store
+    (an indexed query on SQLite), instead of keeping a second copy in memory
+    """
+
+    def __init__(self, store: StateStore, name: str):
+        self.store = store
+        self.name = name
+
+    def __contains__(self, login: str) -> bool:
+        return self.store.contains(self.name, login)
+
+    def __len__(self) -> int:
+        return self.store.count(self.name)
+
+
+def migrate_json_to_sqlite(json_store: JsonStateStore, sqlite_store: SQLiteStateStore) -> bool:
+    """One-shot import of the legacy JSON files into a fresh SQLite store"""
+    if sqlite_store.get_meta('migrated_at'):
+        return False
+
+    sets = {name: json_store.load_set(name) for name in MIGRATED_SETS}
+    documents = {}
+    for name in MIGRATED_DOCUMENTS:
+        data = json_store.load_document(name)
+        if data is not None:
+            documents[name] = data
+
+    sqlite_store.import_state(sets, documents)
+    logger.info(
+        f"📦 Migrated {sum(len(logins) for logins in sets.values())} logins and "
+        f"{len(documents)} state file(s) into {sqlite_store.db_path}"
+    )
+    return True
+
+
+def create_state_store(config: dict, json_paths: Dict[str, Path]) -> StateStore:
+    """Build the state backend selected by the `state_backend` config key"""
+    backend = config.get('state_backend', 'sqlite')
+    json_store = JsonStateStore(json_paths)
+    if backend == 'json':
+        store = json_store
+    elif backend == 'sqlite':
+        store = SQLiteStateStore(Path(config.get('state_db', 'state.db')))
+        migrate_json_to_sqlite(json_store, store)
+    else:
+        raise ValueError(f"Unknown state_backend: {backend}")
+    return WriteBehindStore(store, flush_interval=config.get('state_flush_interval_seconds', 30))
@@ -0,0 +1,200 @@
+"""
+GitHub Follower Bot - HTTP Transport
+Middleware chain underneath the PyGithub requester
+
+Created by: dewhush
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Request:
+    """An outgoing HTTP request as seen by the middleware chain"""
+
+    def __init__(self, verb: str, url: str, headers: Dict[str, str], body=None):
+        self.verb = verb
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+
+class Response:
+    """An HTTP response, shaped like the httplib response PyGithub expects"""
+
+    def __init__(self, status: int, headers: Dict[str, str], text: str):
+        self.status = status
+        self.headers = {k.lower(): v for k, v in headers.items()}
+        self.text = text
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self) -> str:
+        return self.text
+
+
+# A middleware receives the request and the next handler in the chain
+Middleware = Callable[[Request, Callable[[Request], Response]], Response]
+
+
+class Transport:
+    """
+    Ordered list of middlewares wrapped around the PyGithub connection.
+    The first middleware added is the outermost one.
+    """
+
+    def __init__(self):
+        self.middlewares: List[Middleware] = []
+
+    def add(self, middleware: Middleware):
+        self.middlewares.append(middleware)
+        return middleware
+
+    def handle(self, request: Request, send: Callable[[Request], Response]) -> Response:
+        """Run a request through every middleware, ending with `send`"""
+        handler = send
+        for middleware in reversed(self.middlewares):
+            handler = _bind(middleware, handler)
+        return handler(request)
+
+    def install(self, github):
+        """Route every request made by a `Github` client through this transport"""
+        # PyGithub has no public hook for this; swap the requester's connection class
+        requester = github._Github__requester
+        base = requester._Requester__connectionClass
+        if issubclass(base, _TransportConnection):
+            base = base.__bases__[-1]
+        requester._Requester__connectionClass = type(
+            f'Transport{base.__name__}', (_TransportConnection, base),
+            {'transport': self, '_pending': threading.local()}
+        )
+        requester._Requester__connection = None
+
+
+def _bind(middleware: Middleware, send: Callable[[Request], Response]) -> Callable[[Request], Response]:
+    return lambda request: middleware(request, send)
+
+
+class _TransportConnection:
+    """Mixin over PyGithub's requests-based connection classes"""
+
+    transport: Transport
+    # PyGithub calls request() then getresponse() on a shared connection; keep the pair per thread
+    _pending: threading.local
+
+    def request(self, verb, url, input, headers):
+        self._pending.request = Request(verb, url, dict(headers), input)
+
+    def getresponse(self) -> Response:
+        return self.transport.handle(self._pending.request, self._send)
+
+    def _send(self, request: Request) -> Response:
+        r = self.session.request(
+            request.verb,
+            f"{self.protocol}://{self.host}:{self.port}{request.url}",
+            headers=request.headers,
+            data=request.body,
+            timeout=self.timeout,
+            verify=self.verify,
+            allow_redirects=False,
+        )
+        return Response(r.status_code, dict(r.headers), r.text)
+
+
+class RequestCounter:
+    """Counts the requests that actually reach the network"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request: Request, send) -> Response:
+        with self._lock:
+            self.count += 1
+        return send(request)
+
+
+# ============== Conditional Request Cache ==============
+
+DEFAULT_CACHED_PATHS = [
+    r'^/user/(followers|following)\b',
+    r'^/users/[^/]+/(followers|following)\b',
+]
+
+
+class ETagCache:
+    """
+    Persistent per-URL (and therefore per-page) ETag cache.
+    Cached GETs are revalidated with If-None-Match; a 304 answer, which does not
+    count against the rate limit, is turned back into the stored 200 response.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY,
+            etag TEXT NOT NULL,
+            headers TEXT NOT NULL,
+            body TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: Path, paths: Optional[List[str]] = None):
+        self.db_path = Path(db_path)
+        self.patterns = [re.compile(p) for p in (paths or DEFAULT_CACHED_PATHS)]
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(self.SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def _cacheable(self, request: Request) -> bool:
+        return request.verb == 'GET' and any(p.search(request.url) for p in self.patterns)
+
+    def __call__(self, request: Request, send) -> Response:
+        if not self._cacheable(request):
+            return send(request)
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, headers, body FROM responses WHERE url = ?', (request.url,)
+            ).fetchone()
+        if row:
+            request.headers['If-None-Match'] = row[0]
+
+        response = send(request)
+
+        if response.status == 304 and row:
+            self.hits += 1
+            headers = json.loads(row[1])
+            headers.update(response.headers)  # fresh rate-limit headers
+            return Response(200, headers, row[2])
+
+        self.misses += 1
+        etag = response.headers.get('etag')
+        if response.status == 200 and etag:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses (url, etag, headers, body) VALUES (?, ?, ?, ?)',
+                    (request.url, etag, json.dumps(response.headers), response.text)
+                )
+        return response
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
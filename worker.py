@@ -0,0 +1,44 @@
+"""
+GitHub Follower Bot - Worker Thread
+Runs blocking bot work away from the API event loop
+
+Created by: dewhush
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BotWorker:
+    """
+    Single dedicated thread for all bot work.
+    The bot is not thread-safe, so every call is serialized on this thread
+    while the event loop stays free to answer requests.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bot-worker')
+        self.thread_id: Optional[int] = None
+        self.busy = False
+
+    def _call(self, fn: Callable, args: tuple) -> Any:
+        self.thread_id = threading.get_ident()
+        self.busy = True
+        try:
+            return fn(*args)
+        finally:
+            self.busy = False
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run `fn(*args)` on the worker thread and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, fn, args)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work, optionally waiting for the running call"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)